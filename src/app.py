@@ -1,86 +1,160 @@
 from __future__ import annotations
 
-from ast import Dict
-import json
+import asyncio
+import hashlib
 import os
-import glob
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+import orjson
 from llm_pipeline.pipeline import LLMAnalysisPipeline
-from flask import Flask, jsonify
+from recipe_store import (
+    DATA_DIR,
+    build_recipe_index,
+    get_recipe_index,
+    read_all_recipes,
+    read_recipe,
+)
+from flask import Flask
+from flask_compress import Compress
+from flask import current_app
 from flask import request
-from flask import make_response
 from flask import Response
 
 
+def _json_response(obj) -> Response:
+    return Response(orjson.dumps(obj), mimetype="application/json")
+
+
+_CORS_HEADERS = {
+    "Access-Control-Allow-Methods": "GET,POST,OPTIONS",
+    "Access-Control-Allow-Headers": "Content-Type, Authorization",
+    "Access-Control-Allow-Credentials": "true",
+}
+
+
 def _enable_cors(resp: Response) -> Response:
+    # Credentialed requests need the concrete origin echoed back, not "*"
     resp.headers["Access-Control-Allow-Origin"] = request.headers.get("Origin", "*")
-    resp.headers["Access-Control-Allow-Methods"] = "GET,POST,OPTIONS"
-    resp.headers["Access-Control-Allow-Headers"] = request.headers.get(
-        "Access-Control-Request-Headers", "Content-Type, Authorization"
-    )
-    resp.headers["Access-Control-Allow-Credentials"] = "true"
+    resp.headers.update(_CORS_HEADERS)
     return resp
 
 
-def read_all_recipes() -> list[Dict]:
-    recipes = []
-    for file in glob.glob("data/recipe_*.json"):
-        recipe_id = file.split("_")[1]
-        recipe_name = file.split("_")[2].split(".json")[0]
-        with open(file, "r") as f:
-            recipes.append(
-                {
-                    "id": recipe_id,
-                    "name": recipe_name,
-                    "data": json.load(f),
-                }
-            )
-    return recipes
-
-
-def read_recipe(id: str) -> Dict:
-    for file in glob.glob("data/recipe_*.json"):
-        if id in file:
-            recipe_name = file.split("_")[2].split(".json")[0]
-            with open(file, "r") as f:
-                return {
-                    "id": id,
-                    "name": recipe_name,
-                    "data": json.load(f),
-                }
-    return None
+ENHANCE_CACHE_SIZE = 128
+
+
+def _recipe_digest(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+
+
+def _get_cached_enhancement(key: tuple[str, str]) -> str | None:
+    cache = current_app.config["ENHANCE_CACHE"]
+    # Requests run on several threads; an eviction between get and move_to_end
+    # would otherwise raise KeyError
+    with current_app.config["ENHANCE_CACHE_LOCK"]:
+        cached = cache.get(key)
+        if cached is not None:
+            cache.move_to_end(key)
+    return cached
+
+
+def _cache_enhancement(key: tuple[str, str], enhanced: str) -> None:
+    cache = current_app.config["ENHANCE_CACHE"]
+    with current_app.config["ENHANCE_CACHE_LOCK"]:
+        cache[key] = enhanced
+        cache.move_to_end(key)
+        while len(cache) > ENHANCE_CACHE_SIZE:
+            cache.popitem(last=False)
+
+
+def _get_pipeline() -> LLMAnalysisPipeline:
+    """Build the shared pipeline on first use, so the app starts without an API key."""
+    config = current_app.config
+    pipeline = config["PIPELINE"]
+    if pipeline is None:
+        with config["PIPELINE_LOCK"]:
+            pipeline = config["PIPELINE"]
+            if pipeline is None:
+                pipeline = config["PIPELINE"] = LLMAnalysisPipeline()
+    return pipeline
+
+
+async def _enhance_once(key: tuple[str, str], recipe_file: str) -> str | None:
+    """Run the pipeline for a recipe, sharing one run between concurrent callers."""
+    inflight = current_app.config["ENHANCE_INFLIGHT"]
+    with current_app.config["ENHANCE_INFLIGHT_LOCK"]:
+        future = inflight.get(key)
+        owner = future is None
+        if owner:
+            future = inflight[key] = Future()
+
+    # Each async view runs on its own event loop, so wait on a thread-safe future
+    if not owner:
+        return await asyncio.wrap_future(future)
+
+    try:
+        enhanced_recipe = await _get_pipeline().aprocess_single_recipe(recipe_file)
+        enhanced = None
+        if enhanced_recipe is not None:
+            # Serialize in pydantic-core directly rather than via model_dump()
+            enhanced = enhanced_recipe.model_dump_json()
+            _cache_enhancement(key, enhanced)
+        future.set_result(enhanced)
+        return enhanced
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with current_app.config["ENHANCE_INFLIGHT_LOCK"]:
+            inflight.pop(key, None)
 
 
 def create_app() -> Flask:
     app = Flask(__name__)
+    app.config["COMPRESS_ALGORITHM"] = ["br", "gzip"]
+    app.config["COMPRESS_BR_LEVEL"] = 4
+    app.config["COMPRESS_MIN_SIZE"] = 500
+    Compress(app)
+    app.config["RECIPE_INDEX"] = build_recipe_index()
+    app.config["RECIPE_INDEX_MTIME"] = os.stat(DATA_DIR).st_mtime
+    app.config["PIPELINE"] = None
+    app.config["PIPELINE_LOCK"] = threading.Lock()
+    app.config["ENHANCE_CACHE"] = OrderedDict()
+    app.config["ENHANCE_CACHE_LOCK"] = threading.Lock()
+    app.config["ENHANCE_INFLIGHT"] = {}
+    app.config["ENHANCE_INFLIGHT_LOCK"] = threading.Lock()
+    # Flask answers OPTIONS preflights itself; this adds CORS to every response
+    app.after_request(_enable_cors)
 
     @app.get("/")
     def all():
-        return _enable_cors(jsonify(read_all_recipes())), 200
+        return _json_response(read_all_recipes()), 200
 
     @app.get("/recipe/<id>")
     def recipe(id: str):
-        return _enable_cors(jsonify(read_recipe(id))), 200
+        return _json_response(read_recipe(id)), 200
 
     @app.get("/recipe/<id>/enhance")
-    def enhance(id: str):
-        receipt_file = None
-        for file in glob.glob("data/recipe_*.json"):
-            if id in file:
-                receipt_file = file
-                break
-        if receipt_file is None:
-            return jsonify({"message": "Recipe not found"}), 404
-
-        enhanced_recipe = LLMAnalysisPipeline().process_single_recipe(receipt_file)
-        if enhanced_recipe is None:
-            return _enable_cors(jsonify({"message": "No modifications found"})), 200
-        return _enable_cors(jsonify(enhanced_recipe.model_dump())), 200
-
-    @app.route("/", methods=["OPTIONS"])
-    @app.route("/recipe/<id>", methods=["OPTIONS"])
-    @app.route("/recipe/<id>/enhance", methods=["OPTIONS"])
-    def options(id: str | None = None):
-        return _enable_cors(make_response("", 204))
+    async def enhance(id: str):
+        entry = get_recipe_index().get(id)
+        if entry is None:
+            return _json_response({"message": "Recipe not found"}), 404
+        receipt_file = entry["path"]
+
+        # Results are keyed on the recipe content so edits to the file miss the cache
+        digest = _recipe_digest(receipt_file)
+        cache_key = (id, digest)
+        enhanced = _get_cached_enhancement(cache_key)
+        if enhanced is None:
+            enhanced = await _enhance_once(cache_key, receipt_file)
+            if enhanced is None:
+                return _json_response({"message": "No modifications found"}), 200
+
+        resp = Response(enhanced, mimetype="application/json")
+        resp.set_etag(f"{id}-{digest}")
+        return resp.make_conditional(request)
 
     return app
 
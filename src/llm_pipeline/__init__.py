@@ -17,6 +17,7 @@ from .models import (
     ModificationApplied,
     EnhancementSummary,
 )
+from .prompt_cache import PromptCache
 from .tweak_extractor import TweakExtractor
 from .recipe_modifier import RecipeModifier
 from .enhanced_recipe_generator import EnhancedRecipeGenerator
@@ -28,6 +29,7 @@ __all__ = [
     "EnhancedRecipe",
     "ModificationApplied",
     "EnhancementSummary",
+    "PromptCache",
     "TweakExtractor",
     "RecipeModifier",
     "EnhancedRecipeGenerator",
@@ -7,10 +7,11 @@ comprehensive enhanced recipe objects.
 """
 
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 
 from loguru import logger
 
+from .file_io import write_bytes
 from .models import (
     ChangeRecord,
     EnhancedRecipe,
@@ -46,7 +47,8 @@ class EnhancedRecipeGenerator:
         Returns:
             SourceReview with attribution information
         """
-        return SourceReview(
+        # Review fields are already validated, so skip re-validation
+        return SourceReview.model_construct(
             text=review.text, reviewer=review.username, rating=review.rating
         )
 
@@ -67,7 +69,7 @@ class EnhancedRecipeGenerator:
         Returns:
             ModificationApplied with full attribution
         """
-        return ModificationApplied(
+        return ModificationApplied.model_construct(
             source_review=self.create_source_review(source_review),
             modification_type=modification.modification_type,
             reasoning=modification.reasoning,
@@ -86,20 +88,24 @@ class EnhancedRecipeGenerator:
         Returns:
             EnhancementSummary with aggregate statistics
         """
-        total_changes = sum(len(mod.changes_made) for mod in modifications_applied)
-        change_types = list(set(mod.modification_type for mod in modifications_applied))
-
-        # Generate expected impact summary
+        # Single pass: count changes, dedupe types in order, keep the top 3 reasonings
+        total_changes = 0
+        seen_types: Dict[str, None] = {}
         impact_descriptions = []
+        total_reasonings = 0
         for mod in modifications_applied:
+            total_changes += len(mod.changes_made)
+            seen_types[mod.modification_type] = None
             if mod.reasoning:
-                impact_descriptions.append(mod.reasoning)
+                total_reasonings += 1
+                if len(impact_descriptions) < 3:
+                    impact_descriptions.append(mod.reasoning)
+        change_types = list(seen_types)
 
-        expected_impact = "; ".join(impact_descriptions[:3])  # Limit to top 3
-        if len(impact_descriptions) > 3:
-            expected_impact += (
-                f" (and {len(impact_descriptions) - 3} more improvements)"
-            )
+        # Generate expected impact summary
+        expected_impact = "; ".join(impact_descriptions)
+        if total_reasonings > 3:
+            expected_impact += f" (and {total_reasonings - 3} more improvements)"
 
         return EnhancementSummary(
             total_changes=total_changes,
@@ -126,16 +132,39 @@ class EnhancedRecipeGenerator:
             source_review: Review that suggested the modification
             change_records: Changes made for the modification
 
+        Returns:
+            Complete EnhancedRecipe with attribution
+        """
+        return self.generate_enhanced_recipe_from_modifications(
+            original_recipe,
+            modified_recipe,
+            [(modification, source_review, change_records)],
+        )
+
+    def generate_enhanced_recipe_from_modifications(
+        self,
+        original_recipe: Recipe,
+        modified_recipe: Recipe,
+        applied: List[Tuple[ModificationObject, Review, List[ChangeRecord]]],
+    ) -> EnhancedRecipe:
+        """
+        Generate a complete enhanced recipe from several applied modifications.
+
+        Args:
+            original_recipe: Original unmodified recipe
+            modified_recipe: Recipe with all modifications applied
+            applied: (modification, source_review, change_records) per modification
+
         Returns:
             Complete EnhancedRecipe with attribution
         """
         logger.info(f"Generating enhanced recipe for: {original_recipe.title}")
 
-        # Create modification applied record
-        modification_applied = self.create_modification_applied(
-            modification, source_review, change_records
-        )
-        modifications_applied = [modification_applied]
+        # Create modification applied records
+        modifications_applied = [
+            self.create_modification_applied(modification, source_review, records)
+            for modification, source_review, records in applied
+        ]
 
         # Calculate enhancement summary
         enhancement_summary = self.calculate_enhancement_summary(modifications_applied)
@@ -155,10 +184,10 @@ class EnhancedRecipeGenerator:
             enhancement_summary=enhancement_summary,
             description=original_recipe.description,
             servings=original_recipe.servings,
-            prep_time=getattr(original_recipe, "prep_time", None),
-            cook_time=getattr(original_recipe, "cook_time", None),
-            total_time=getattr(original_recipe, "total_time", None),
-            created_at=datetime.now().isoformat(),
+            prep_time=original_recipe.prep_time,
+            cook_time=original_recipe.cook_time,
+            total_time=original_recipe.total_time,
+            created_at=datetime.now().isoformat(timespec="seconds"),
             pipeline_version=self.pipeline_version,
         )
 
@@ -182,6 +211,32 @@ class EnhancedRecipeGenerator:
         Returns:
             Dictionary with comparison data
         """
+        summary = enhanced_recipe.enhancement_summary
+        modifications_applied = enhanced_recipe.modifications_applied
+
+        # Build citations in one flat pass over the applied modifications
+        citations = []
+        citations_append = citations.append
+        for mod in modifications_applied:
+            source_review = mod.source_review
+            citations_append(
+                {
+                    "reviewer": source_review.reviewer,
+                    "rating": source_review.rating,
+                    "modification_type": mod.modification_type,
+                    "reasoning": mod.reasoning,
+                    "changes": [
+                        {
+                            "type": change.type,
+                            "from": change.from_text,
+                            "to": change.to_text,
+                            "operation": change.operation,
+                        }
+                        for change in mod.changes_made
+                    ],
+                }
+            )
+
         comparison = {
             "original": {
                 "title": original_recipe.title,
@@ -196,29 +251,12 @@ class EnhancedRecipeGenerator:
                 "servings": enhanced_recipe.servings,
             },
             "changes": {
-                "total_modifications": len(enhanced_recipe.modifications_applied),
-                "total_changes": enhanced_recipe.enhancement_summary.total_changes,
-                "change_types": enhanced_recipe.enhancement_summary.change_types,
-                "expected_impact": enhanced_recipe.enhancement_summary.expected_impact,
+                "total_modifications": len(modifications_applied),
+                "total_changes": summary.total_changes,
+                "change_types": summary.change_types,
+                "expected_impact": summary.expected_impact,
             },
-            "citations": [
-                {
-                    "reviewer": mod.source_review.reviewer,
-                    "rating": mod.source_review.rating,
-                    "modification_type": mod.modification_type,
-                    "reasoning": mod.reasoning,
-                    "changes": [
-                        {
-                            "type": change.type,
-                            "from": change.from_text,
-                            "to": change.to_text,
-                            "operation": change.operation,
-                        }
-                        for change in mod.changes_made
-                    ],
-                }
-                for mod in enhanced_recipe.modifications_applied
-            ],
+            "citations": citations,
         }
 
         return comparison
@@ -236,15 +274,13 @@ class EnhancedRecipeGenerator:
         Returns:
             Path to the saved file
         """
-        import json
         import os
 
         # Ensure output directory exists
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
 
-        # Convert to dict and save
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(enhanced_recipe.model_dump(), f, indent=2, ensure_ascii=False)
+        # Serialize straight to JSON and save
+        write_bytes(output_path, enhanced_recipe.model_dump_json(indent=2).encode())
 
         logger.info(f"Saved enhanced recipe to: {output_path}")
         return output_path
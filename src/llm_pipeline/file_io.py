@@ -0,0 +1,27 @@
+"""
+File output helpers for the LLM Analysis Pipeline.
+
+Pipeline outputs are serialized to bytes up front, so they are written with a
+raw os.write loop instead of going through Python's buffered file objects.
+"""
+
+import os
+from typing import Union
+
+
+def write_bytes(path: Union[str, os.PathLike], data: bytes) -> None:
+    """
+    Write a complete byte payload to a file, replacing any existing content.
+
+    Args:
+        path: Destination file path
+        data: Serialized file content
+    """
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            written = os.write(fd, view)
+            view = view[written:]
+    finally:
+        os.close(fd)
@@ -7,7 +7,7 @@ and all intermediate data formats used throughout the pipeline.
 
 from typing import Any, Dict, List, Literal, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import AliasChoices, BaseModel, Field, field_validator
 
 
 class ModificationEdit(BaseModel):
@@ -125,12 +125,22 @@ class EnhancedRecipe(BaseModel):
 class Recipe(BaseModel):
     """Base recipe model for input data."""
 
-    recipe_id: str
-    title: str
-    ingredients: List[str]
-    instructions: List[str]
+    recipe_id: str = "unknown"
+    title: str = "Unknown Recipe"
+    ingredients: List[str] = []
+    instructions: List[str] = []
     description: Optional[str] = None
     servings: Optional[str] = None
+    # Scraped files store times under lowercased JSON-LD keys (e.g. "preptime")
+    prep_time: Optional[str] = Field(
+        default=None, validation_alias=AliasChoices("prep_time", "preptime")
+    )
+    cook_time: Optional[str] = Field(
+        default=None, validation_alias=AliasChoices("cook_time", "cooktime")
+    )
+    total_time: Optional[str] = Field(
+        default=None, validation_alias=AliasChoices("total_time", "totaltime")
+    )
     rating: Optional[Dict[str, Any]] = None
     # Include other fields as needed
 
@@ -142,3 +152,23 @@ class Review(BaseModel):
     rating: Optional[int] = None
     username: Optional[str] = None
     has_modification: bool = False
+
+
+class RecipeFile(Recipe):
+    """Scraped recipe file: recipe fields plus its reviews, parsed in one pass."""
+
+    reviews: List[Review] = []
+
+    @field_validator("reviews", mode="before")
+    @classmethod
+    def drop_reviews_without_text(cls, value: Any) -> Any:
+        """Skip reviews with no text before they are validated."""
+        if isinstance(value, list):
+            return [r for r in value if not isinstance(r, dict) or r.get("text")]
+        return value
+
+    def to_recipe(self) -> Recipe:
+        """Return the plain Recipe part without re-validating it."""
+        return Recipe.model_construct(
+            **{name: getattr(self, name) for name in Recipe.model_fields}
+        )
@@ -0,0 +1,96 @@
+"""
+Persistent cache of parsed recipe files.
+
+Each entry holds the pickled (Recipe, reviews) parsed from a scraped JSON file,
+keyed by the file's absolute path and validated against its mtime and size.
+Keys also carry a fingerprint of the Recipe/Review schemas so entries pickled
+before a model change are never served.
+"""
+
+import hashlib
+import pickle
+import sqlite3
+import threading
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+
+import orjson
+from loguru import logger
+
+from .models import Recipe, Review
+
+# Bump to invalidate every entry by hand (e.g. after a parsing change that does
+# not alter the model schemas)
+PARSE_CACHE_VERSION = 1
+
+
+def _schema_fingerprint() -> str:
+    """Hash the cache version and model schemas that pickled entries depend on."""
+    schemas = [Recipe.model_json_schema(), Review.model_json_schema()]
+    payload = orjson.dumps(
+        [PARSE_CACHE_VERSION, schemas], option=orjson.OPT_SORT_KEYS
+    )
+    return hashlib.sha256(payload).hexdigest()[:16]
+
+
+class ParseCache:
+    """SQLite-backed cache mapping recipe files to their parsed models."""
+
+    def __init__(self, db_path: Union[str, Path]):
+        """
+        Initialize the ParseCache.
+
+        Args:
+            db_path: Path to the SQLite database file
+        """
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._schema = _schema_fingerprint()
+        # One connection shared by worker threads (asyncio.to_thread, Flask
+        # requests); the lock serializes access to it
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS parsed "
+                "(key TEXT PRIMARY KEY, mtime_ns INTEGER NOT NULL, "
+                "size INTEGER NOT NULL, payload BLOB NOT NULL)"
+            )
+        logger.info(f"Initialized ParseCache at: {db_path}")
+
+    def _key(self, path: str) -> str:
+        """Combine the schema fingerprint with a file path."""
+        return f"{self._schema}:{path}"
+
+    def get(
+        self, path: str, mtime_ns: int, size: int
+    ) -> Optional[Tuple[Recipe, List[Review]]]:
+        """Return the parsed models for a file, or None if missing or stale."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT mtime_ns, size, payload FROM parsed WHERE key = ?",
+                (self._key(path),),
+            ).fetchone()
+        if row is None or (row[0], row[1]) != (mtime_ns, size):
+            return None
+        try:
+            return pickle.loads(row[2])
+        except Exception as e:
+            logger.warning(f"Discarding unreadable parse cache entry for {path}: {e}")
+            return None
+
+    def set(
+        self,
+        path: str,
+        mtime_ns: int,
+        size: int,
+        recipe: Recipe,
+        reviews: List[Review],
+    ) -> None:
+        """Store the parsed models for a file, replacing any previous entry."""
+        payload = pickle.dumps((recipe, reviews), protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO parsed (key, mtime_ns, size, payload) "
+                "VALUES (?, ?, ?, ?)",
+                (self._key(path), mtime_ns, size, payload),
+            )
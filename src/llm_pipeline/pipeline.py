@@ -9,19 +9,47 @@ This module coordinates the complete 3-step pipeline:
 Processes recipe data from scraped JSON files and outputs enhanced recipes.
 """
 
-import json
+import asyncio
+import os
+import re
+from collections import Counter
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
+import orjson
 from dotenv import load_dotenv
 from loguru import logger
 
 from .enhanced_recipe_generator import EnhancedRecipeGenerator
-from .models import EnhancedRecipe, Recipe, Review
+from .file_io import write_bytes
+from .models import (
+    EnhancedRecipe,
+    ModificationObject,
+    Recipe,
+    RecipeFile,
+    Review,
+)
+from .parse_cache import ParseCache
+from .prompt_cache import PromptCache
 from .recipe_modifier import RecipeModifier
 from .tweak_extractor import TweakExtractor
 
 
+_SLUG_RE = re.compile(r"[^a-z0-9]+")
+
+
+def _slugify(text: str, max_length: int = 30) -> str:
+    """Lowercase text and collapse anything but letters and digits into dashes."""
+    return _SLUG_RE.sub("-", text.lower()).strip("-")[:max_length]
+
+
+@lru_cache(maxsize=1)
+def _load_env_once() -> None:
+    """Load .env once per process rather than on every pipeline construction."""
+    load_dotenv()
+
+
 class LLMAnalysisPipeline:
     """Complete pipeline for analyzing recipes and generating enhanced versions."""
 
@@ -30,6 +58,7 @@ class LLMAnalysisPipeline:
         openai_api_key: Optional[str] = None,
         output_dir: str = "data/enhanced",
         pipeline_version: str = "1.0.0",
+        concurrency: int = 4,
     ):
         """
         Initialize the complete LLM Analysis Pipeline.
@@ -38,15 +67,24 @@ class LLMAnalysisPipeline:
             openai_api_key: OpenAI API key (loads from env if not provided)
             output_dir: Directory to save enhanced recipes
             pipeline_version: Version identifier for tracking
+            concurrency: Number of recipes processed concurrently by
+                process_recipe_directory (bounded by the API rate limit)
         """
         # Load environment variables
-        load_dotenv()
+        _load_env_once()
 
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.concurrency = concurrency
+
+        # Parsed (Recipe, reviews) per file, reused while the file is unchanged
+        self._parse_cache = ParseCache(self.output_dir / ".parse_cache.sqlite3")
 
         # Initialize pipeline components
-        self.tweak_extractor = TweakExtractor(api_key=openai_api_key)
+        self.tweak_extractor = TweakExtractor(
+            api_key=openai_api_key,
+            cache=PromptCache(self.output_dir / ".prompt_cache.sqlite3"),
+        )
         self.recipe_modifier = RecipeModifier()
         self.enhanced_generator = EnhancedRecipeGenerator(
             pipeline_version=pipeline_version
@@ -65,8 +103,8 @@ class LLMAnalysisPipeline:
         Returns:
             Recipe data dictionary
         """
-        with open(file_path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        with open(file_path, "rb") as f:
+            return orjson.loads(f.read())
 
     def parse_recipe_data(self, recipe_data: Dict[str, Any]) -> Recipe:
         """
@@ -78,15 +116,8 @@ class LLMAnalysisPipeline:
         Returns:
             Recipe object
         """
-        return Recipe(
-            recipe_id=recipe_data.get("recipe_id", "unknown"),
-            title=recipe_data.get("title", "Unknown Recipe"),
-            ingredients=recipe_data.get("ingredients", []),
-            instructions=recipe_data.get("instructions", []),
-            description=recipe_data.get("description"),
-            servings=recipe_data.get("servings"),
-            rating=recipe_data.get("rating"),
-        )
+        # Defaults and the scraped preptime/cooktime/totaltime keys live on the model
+        return Recipe.model_validate(recipe_data)
 
     def parse_reviews_data(self, recipe_data: Dict[str, Any]) -> List[Review]:
         """
@@ -98,20 +129,123 @@ class LLMAnalysisPipeline:
         Returns:
             List of Review objects
         """
-        reviews = []
-        raw_reviews = recipe_data.get("reviews", [])
+        return [
+            Review.model_validate(review_data)
+            for review_data in recipe_data.get("reviews", ())
+            if review_data.get("text")
+        ]
 
-        for review_data in raw_reviews:
-            if review_data.get("text"):
-                review = Review(
-                    text=review_data["text"],
-                    rating=review_data.get("rating"),
-                    username=review_data.get("username"),
-                    has_modification=review_data.get("has_modification", False),
-                )
-                reviews.append(review)
+    def _load_parsed_recipe(self, recipe_file: str) -> Tuple[Recipe, List[Review]]:
+        """
+        Load and parse a recipe file, reusing the on-disk parse cache when possible.
+
+        Args:
+            recipe_file: Path to recipe JSON file
+
+        Returns:
+            Tuple of (Recipe, reviews)
+        """
+        stat = os.stat(recipe_file)
+        cache_key = os.path.abspath(recipe_file)
+
+        cached = self._parse_cache.get(cache_key, stat.st_mtime_ns, stat.st_size)
+        if cached is not None:
+            return cached
+
+        # Parse and validate straight from bytes, skipping the intermediate dict
+        with open(recipe_file, "rb") as f:
+            recipe_file_data = RecipeFile.model_validate_json(f.read())
+        recipe = recipe_file_data.to_recipe()
+        reviews = recipe_file_data.reviews
+
+        self._parse_cache.set(
+            cache_key, stat.st_mtime_ns, stat.st_size, recipe, reviews
+        )
+        return recipe, reviews
+
+    def _load_recipe_inputs(
+        self, recipe_file: str
+    ) -> Optional[Tuple[Recipe, List[Review]]]:
+        """
+        Load a recipe file and parse it into a Recipe and its Reviews.
+
+        Args:
+            recipe_file: Path to recipe JSON file
+
+        Returns:
+            Tuple of (Recipe, reviews), or None if no review has modifications
+        """
+        logger.info(f"Processing recipe file: {recipe_file}")
+
+        # Step 0: Load and parse data
+        recipe, reviews = self._load_parsed_recipe(recipe_file)
+
+        modification_count = sum(1 for r in reviews if r.has_modification)
+
+        logger.info(f"Loaded recipe: {recipe.title}")
+        logger.info(
+            f"Found {len(reviews)} reviews, {modification_count} with modifications"
+        )
+
+        if modification_count == 0:
+            logger.warning("No reviews with modifications found")
+            return None
+
+        return recipe, reviews
+
+    def _build_enhanced_recipe(
+        self,
+        recipe: Recipe,
+        modification: ModificationObject,
+        source_review: Review,
+        save_output: bool,
+    ) -> EnhancedRecipe:
+        """
+        Apply an extracted modification and generate the enhanced recipe (steps 2-3).
 
-        return reviews
+        Args:
+            recipe: Original recipe
+            modification: Modification extracted in step 1
+            source_review: Review the modification came from
+            save_output: Whether to save the enhanced recipe
+
+        Returns:
+            Generated EnhancedRecipe
+        """
+        logger.info(
+            f"Successfully extracted {modification.modification_type} modification"
+        )
+
+        # Step 2: Apply modification to recipe
+        logger.info("Step 2: Applying modification to recipe...")
+        modified_recipe, change_records = self.recipe_modifier.apply_modification(
+            recipe, modification
+        )
+
+        logger.info(f"Applied modification: {len(change_records)} total changes made")
+
+        # Step 3: Generate enhanced recipe with attribution
+        logger.info("Step 3: Generating enhanced recipe with attribution...")
+
+        enhanced_recipe = self.enhanced_generator.generate_enhanced_recipe(
+            recipe, modified_recipe, modification, source_review, change_records
+        )
+
+        logger.info(f"Generated enhanced recipe: {enhanced_recipe.title}")
+
+        # Save output
+        if save_output:
+            self._save_enhanced_recipe(recipe, enhanced_recipe)
+
+        return enhanced_recipe
+
+    def _save_enhanced_recipe(
+        self, recipe: Recipe, enhanced_recipe: EnhancedRecipe
+    ) -> None:
+        """Save an enhanced recipe under the output directory."""
+        output_filename = f"enhanced_{recipe.recipe_id}_{_slugify(recipe.title)}.json"
+        output_path = self.output_dir / output_filename
+        self.enhanced_generator.save_enhanced_recipe(enhanced_recipe, str(output_path))
 
     def process_single_recipe(
         self, recipe_file: str, save_output: bool = True
@@ -127,21 +261,10 @@ class LLMAnalysisPipeline:
             EnhancedRecipe if successful, None otherwise
         """
         try:
-            logger.info(f"Processing recipe file: {recipe_file}")
-
-            # Step 0: Load and parse data
-            recipe_data = self.load_recipe_data(recipe_file)
-            recipe = self.parse_recipe_data(recipe_data)
-            reviews = self.parse_reviews_data(recipe_data)
-
-            logger.info(f"Loaded recipe: {recipe.title}")
-            logger.info(
-                f"Found {len(reviews)} reviews, {len([r for r in reviews if r.has_modification])} with modifications"
-            )
-
-            if not any(r.has_modification for r in reviews):
-                logger.warning("No reviews with modifications found")
+            inputs = self._load_recipe_inputs(recipe_file)
+            if inputs is None:
                 return None
+            recipe, reviews = inputs
 
             # Step 1: Extract modification from one random review
             logger.info("Step 1: Extracting modification from a single review...")
@@ -153,49 +276,206 @@ class LLMAnalysisPipeline:
                 logger.warning("No modification could be extracted")
                 return None
 
-            logger.info(
-                f"Successfully extracted {modification.modification_type} modification"
+            return self._build_enhanced_recipe(
+                recipe, modification, source_review, save_output
             )
 
-            # Step 2: Apply modification to recipe
-            logger.info("Step 2: Applying modification to recipe...")
-            modified_recipe, change_records = self.recipe_modifier.apply_modification(
-                recipe, modification
+        except Exception as e:
+            logger.exception(f"Failed to process recipe {recipe_file}: {e}")
+            return None
+
+    def process_recipe_all_modifications(
+        self, recipe_file: str, save_output: bool = True
+    ) -> Optional[EnhancedRecipe]:
+        """
+        Process a recipe applying modifications from every review, not just one.
+
+        Reviews are sent to the LLM in batches so the static prompt prefix and
+        request latency are shared across several reviews.
+
+        Args:
+            recipe_file: Path to recipe JSON file
+            save_output: Whether to save the enhanced recipe
+
+        Returns:
+            EnhancedRecipe if successful, None otherwise
+        """
+        try:
+            inputs = self._load_recipe_inputs(recipe_file)
+            if inputs is None:
+                return None
+            recipe, reviews = inputs
+
+            # Step 1: Extract modifications from all reviews in batches
+            logger.info("Step 1: Extracting modifications from all reviews...")
+            extracted = self.tweak_extractor.extract_modifications_batch(
+                reviews, recipe
             )
 
-            logger.info(
-                f"Applied modification: {len(change_records)} total changes made"
+            if not extracted:
+                logger.warning("No modification could be extracted")
+                return None
+
+            # Step 2: Apply modifications to recipe in order
+            logger.info("Step 2: Applying modifications to recipe...")
+            modified_recipe, change_records = (
+                self.recipe_modifier.apply_modifications_batch(
+                    recipe, [modification for modification, _ in extracted]
+                )
             )
 
             # Step 3: Generate enhanced recipe with attribution
             logger.info("Step 3: Generating enhanced recipe with attribution...")
-
-            enhanced_recipe = self.enhanced_generator.generate_enhanced_recipe(
-                recipe, modified_recipe, modification, source_review, change_records
+            enhanced_recipe = (
+                self.enhanced_generator.generate_enhanced_recipe_from_modifications(
+                    recipe,
+                    modified_recipe,
+                    [
+                        (modification, source_review, records)
+                        for (modification, source_review), records in zip(
+                            extracted, change_records
+                        )
+                    ],
+                )
             )
 
             logger.info(f"Generated enhanced recipe: {enhanced_recipe.title}")
 
-            # Save output
             if save_output:
-                output_filename = f"enhanced_{recipe.recipe_id}_{recipe.title.lower().replace(' ', '-')[:30]}.json"
-                output_path = self.output_dir / output_filename
-                self.enhanced_generator.save_enhanced_recipe(
-                    enhanced_recipe, str(output_path)
-                )
+                self._save_enhanced_recipe(recipe, enhanced_recipe)
 
             return enhanced_recipe
 
         except Exception as e:
-            logger.error(f"Failed to process recipe {recipe_file}: {e}")
-            import traceback
+            logger.exception(f"Failed to process recipe {recipe_file}: {e}")
+            return None
+
+    async def aprocess_single_recipe(
+        self, recipe_file: str, save_output: bool = True
+    ) -> Optional[EnhancedRecipe]:
+        """
+        Async variant of process_single_recipe; the LLM call does not block the loop.
+
+        Args:
+            recipe_file: Path to recipe JSON file
+            save_output: Whether to save the enhanced recipe
 
-            traceback.print_exc()
+        Returns:
+            EnhancedRecipe if successful, None otherwise
+        """
+        inputs = await self._aload_recipe_inputs(recipe_file)
+        if inputs is None:
             return None
+        return await self._aenhance_recipe(recipe_file, inputs, save_output)
 
-    def process_recipe_directory(self, data_dir: str = "data") -> List[EnhancedRecipe]:
+    async def _aload_recipe_inputs(
+        self, recipe_file: str
+    ) -> Optional[Tuple[Recipe, List[Review]]]:
+        """Load and parse a recipe file off the event loop, logging failures."""
+        try:
+            return await asyncio.to_thread(self._load_recipe_inputs, recipe_file)
+        except Exception as e:
+            logger.exception(f"Failed to process recipe {recipe_file}: {e}")
+            return None
+
+    async def _aenhance_recipe(
+        self,
+        recipe_file: str,
+        inputs: Tuple[Recipe, List[Review]],
+        save_output: bool,
+    ) -> Optional[EnhancedRecipe]:
         """
-        Process all recipe files in a directory.
+        Run steps 1-3 on an already parsed recipe.
+
+        Args:
+            recipe_file: Path the recipe was loaded from (for logging)
+            inputs: Tuple of (Recipe, reviews) from _load_recipe_inputs
+            save_output: Whether to save the enhanced recipe
+
+        Returns:
+            EnhancedRecipe if successful, None otherwise
+        """
+        recipe, reviews = inputs
+        try:
+            # Step 1: Extract modification from one random review
+            logger.info("Step 1: Extracting modification from a single review...")
+            modification, source_review = (
+                await self.tweak_extractor.aextract_single_modification(
+                    reviews, recipe
+                )
+            )
+
+            if not modification or not source_review:
+                logger.warning("No modification could be extracted")
+                return None
+
+            return self._build_enhanced_recipe(
+                recipe, modification, source_review, save_output
+            )
+
+        except Exception as e:
+            logger.exception(f"Failed to process recipe {recipe_file}: {e}")
+            return None
+
+    async def aprocess_recipe_files(
+        self,
+        recipe_files: List[str],
+        max_concurrency: int = 5,
+        save_output: bool = True,
+    ) -> List[Optional[EnhancedRecipe]]:
+        """
+        Process several recipe files concurrently, capping in-flight LLM requests.
+
+        A single loader parses files ahead of the LLM workers through a bounded
+        queue, so disk reads for upcoming recipes overlap with API round-trips.
+
+        Args:
+            recipe_files: Paths to recipe JSON files
+            max_concurrency: Maximum number of recipes processed at once
+            save_output: Whether to save the enhanced recipes
+
+        Returns:
+            EnhancedRecipe (or None on failure) for each file, in input order
+        """
+        num_workers = max(1, min(max_concurrency, len(recipe_files)))
+        queue: asyncio.Queue = asyncio.Queue(maxsize=2 * num_workers)
+        results: List[Optional[EnhancedRecipe]] = [None] * len(recipe_files)
+
+        async def _loader() -> None:
+            for index, recipe_file in enumerate(recipe_files):
+                inputs = await self._aload_recipe_inputs(recipe_file)
+                if inputs is not None:
+                    await queue.put((index, recipe_file, inputs))
+            for _ in range(num_workers):
+                await queue.put(None)
+
+        async def _worker() -> None:
+            while (item := await queue.get()) is not None:
+                index, recipe_file, inputs = item
+                results[index] = await self._aenhance_recipe(
+                    recipe_file, inputs, save_output
+                )
+
+        await asyncio.gather(_loader(), *(_worker() for _ in range(num_workers)))
+        return results
+
+    @staticmethod
+    def _iter_recipe_files(data_dir: str) -> Iterator[str]:
+        """Yield recipe_*.json paths in a directory using cached scandir entries."""
+        with os.scandir(data_dir) as entries:
+            for entry in entries:
+                if (
+                    entry.name.startswith("recipe_")
+                    and entry.name.endswith(".json")
+                    and entry.is_file()
+                ):
+                    yield entry.path
+
+    async def aprocess_recipe_directory(
+        self, data_dir: str = "data"
+    ) -> List[EnhancedRecipe]:
+        """
+        Process all recipe files in a directory concurrently on one event loop.
 
         Args:
             data_dir: Directory containing recipe JSON files
@@ -203,21 +483,23 @@ class LLMAnalysisPipeline:
         Returns:
             List of successfully processed EnhancedRecipe objects
         """
-        data_path = Path(data_dir)
-        recipe_files = list(data_path.glob("recipe_*.json"))
+        recipe_files = list(self._iter_recipe_files(data_dir))
 
         logger.info(f"Found {len(recipe_files)} recipe files to process")
 
-        enhanced_recipes = []
-        for recipe_file in recipe_files:
-            logger.info(f"\n{'=' * 60}")
-            enhanced_recipe = self.process_single_recipe(str(recipe_file))
+        # Each recipe is dominated by an LLM round-trip, so overlap up to
+        # self.concurrency of them
+        results = await self.aprocess_recipe_files(
+            recipe_files, max_concurrency=self.concurrency
+        )
 
+        enhanced_recipes = []
+        for recipe_file, enhanced_recipe in zip(recipe_files, results):
             if enhanced_recipe:
                 enhanced_recipes.append(enhanced_recipe)
                 logger.info(f"✓ Successfully processed: {enhanced_recipe.title}")
             else:
-                logger.warning(f"✗ Failed to process: {recipe_file.name}")
+                logger.warning(f"✗ Failed to process: {os.path.basename(recipe_file)}")
 
         logger.info(f"\n{'=' * 60}")
         logger.info(
@@ -226,6 +508,18 @@ class LLMAnalysisPipeline:
 
         return enhanced_recipes
 
+    def process_recipe_directory(self, data_dir: str = "data") -> List[EnhancedRecipe]:
+        """
+        Process all recipe files in a directory.
+
+        Args:
+            data_dir: Directory containing recipe JSON files
+
+        Returns:
+            List of successfully processed EnhancedRecipe objects
+        """
+        return asyncio.run(self.aprocess_recipe_directory(data_dir))
+
     def generate_summary_report(
         self, enhanced_recipes: List[EnhancedRecipe]
     ) -> Dict[str, Any]:
@@ -241,19 +535,15 @@ class LLMAnalysisPipeline:
         if not enhanced_recipes:
             return {"status": "no_recipes_processed"}
 
-        total_modifications = sum(
-            len(recipe.modifications_applied) for recipe in enhanced_recipes
-        )
-        total_changes = sum(
-            recipe.enhancement_summary.total_changes for recipe in enhanced_recipes
-        )
-
-        change_type_counts = {}
+        # Accumulate all statistics in a single pass over the recipes
+        total_modifications = 0
+        total_changes = 0
+        change_type_counter = Counter()
         for recipe in enhanced_recipes:
-            for change_type in recipe.enhancement_summary.change_types:
-                change_type_counts[change_type] = (
-                    change_type_counts.get(change_type, 0) + 1
-                )
+            total_modifications += len(recipe.modifications_applied)
+            total_changes += recipe.enhancement_summary.total_changes
+            change_type_counter.update(recipe.enhancement_summary.change_types)
+        change_type_counts = dict(change_type_counter)
 
         report = {
             "pipeline_summary": {
@@ -277,7 +567,10 @@ class LLMAnalysisPipeline:
         return report
 
     def save_summary_report(
-        self, enhanced_recipes: List[EnhancedRecipe], output_path: Optional[str] = None
+        self,
+        enhanced_recipes: List[EnhancedRecipe],
+        output_path: Optional[str] = None,
+        pretty: bool = False,
     ) -> str:
         """
         Save pipeline summary report to JSON file.
@@ -285,6 +578,7 @@ class LLMAnalysisPipeline:
         Args:
             enhanced_recipes: List of enhanced recipes
             output_path: Path to save report (auto-generated if None)
+            pretty: Indent the JSON for human reading (compact by default)
 
         Returns:
             Path to saved report
@@ -294,8 +588,8 @@ class LLMAnalysisPipeline:
 
         report = self.generate_summary_report(enhanced_recipes)
 
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(report, f, indent=2, ensure_ascii=False)
+        option = orjson.OPT_INDENT_2 if pretty else None
+        write_bytes(output_path, orjson.dumps(report, option=option))
 
         logger.info(f"Saved pipeline summary report to: {output_path}")
         return output_path
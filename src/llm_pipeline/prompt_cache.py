@@ -0,0 +1,72 @@
+"""
+Persistent exact-match cache for LLM responses.
+
+Responses are stored in a small SQLite database keyed by a SHA-256 hash of
+(model, temperature, prompt), so re-running the pipeline over the same data
+skips the API round-trip entirely.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Union
+
+from loguru import logger
+
+
+class PromptCache:
+    """SQLite-backed cache mapping prompts to raw LLM output."""
+
+    def __init__(
+        self, db_path: Union[str, Path], ttl_seconds: Optional[int] = None
+    ):
+        """
+        Initialize the PromptCache.
+
+        Args:
+            db_path: Path to the SQLite database file
+            ttl_seconds: Entry lifetime in seconds (defaults to PROMPT_CACHE_TTL
+                env var; unset or 0 means entries never expire)
+        """
+        if ttl_seconds is None:
+            ttl_seconds = int(os.getenv("PROMPT_CACHE_TTL", "0"))
+        self.ttl_seconds = ttl_seconds
+
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses "
+                "(key BLOB PRIMARY KEY, response TEXT NOT NULL, ts INTEGER NOT NULL)"
+            )
+        logger.info(f"Initialized PromptCache at: {db_path}")
+
+    @staticmethod
+    def make_key(model: str, temperature: float, prompt: str) -> bytes:
+        """Hash the request parameters that determine the response."""
+        return hashlib.sha256(f"{model}|{temperature}|{prompt}".encode()).digest()
+
+    def get(self, key: bytes) -> Optional[str]:
+        """Return the cached response for a key, or None on miss/expiry."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, ts FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        response, ts = row
+        if self.ttl_seconds and time.time() - ts > self.ttl_seconds:
+            return None
+        return response
+
+    def set(self, key: bytes, response: str) -> None:
+        """Store a response under a key, replacing any previous entry."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, ts) VALUES (?, ?, ?)",
+                (key, response, int(time.time())),
+            )
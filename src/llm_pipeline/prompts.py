@@ -5,6 +5,10 @@ This module contains carefully crafted prompts for extracting structured
 modifications from user review text.
 """
 
+from functools import lru_cache
+
+import orjson
+
 SYSTEM_PROMPT = """You are an expert recipe analyst. Your job is to extract structured recipe modifications from user reviews.
 
 Your goals:
@@ -40,32 +44,66 @@ Tone/style mirroring for added instructions:
 Only extract concrete changes the user actually made, not general suggestions or opinions.
 """
 
-EXTRACTION_PROMPT = """Original Recipe:
-Title: {title}
-Ingredients: {ingredients}
-Instructions: {instructions}
-
-User Review: "{review_text}"
-
-Extract the recipe modifications from this review. The user may have made multiple changes across ingredients and/or instructions.
-
-Output a JSON object with this structure (single object, multiple edits allowed):
-{{
+# Static output spec and dynamic request for the few-shot prompt are kept apart
+# so only the short request needs formatting per call.
+EXTRACTION_OUTPUT_PROMPT = """Output a JSON object with this structure (single object, multiple edits allowed):
+{
     "modification_type": "quantity_adjustment|ingredient_substitution|technique_change|addition|removal",
     "reasoning": "Brief explanation of why this modification improves the recipe; mention any secondary modification types present",
     "edits": [
-        {{
+        {
             "target": "ingredients|instructions",
             "operation": "replace|add_after|remove",
             "find": "exact text to find (from the original recipe)",
             "replace": "replacement text (for replace operations)",
             "add": "text to add (for add_after operations; tone/style must match original instructions when target='instructions')"
-        }}
+        }
     ]
-}}
+}
 
 Focus on concrete changes the user actually made, not general suggestions."""
 
+EXTRACTION_REQUEST_PROMPT = """Original Recipe:
+Title: {title}
+Ingredients: {ingredients}
+Instructions: {instructions}
+
+User Review: "{review_text}"
+
+Extract the recipe modifications from this review. The user may have made multiple changes across ingredients and/or instructions."""
+
+BATCH_OUTPUT_PROMPT = """You will be given several numbered reviews of the same recipe. Extract the modifications from each review separately and wrap them in a single JSON object with this structure:
+{
+    "modifications": [
+        {
+            "review_index": 1,
+            "modification_type": "quantity_adjustment|ingredient_substitution|technique_change|addition|removal",
+            "reasoning": "Brief explanation of why this modification improves the recipe",
+            "edits": [
+                {
+                    "target": "ingredients|instructions",
+                    "operation": "replace|add_after|remove",
+                    "find": "exact text to find (from the original recipe)",
+                    "replace": "replacement text (for replace operations)",
+                    "add": "text to add (for add_after operations)"
+                }
+            ]
+        }
+    ]
+}
+
+Use the review's number as "review_index". Include one entry per review that describes concrete changes; omit reviews that do not."""
+
+BATCH_REQUEST_PROMPT = """Original Recipe:
+Title: {title}
+Ingredients: {ingredients}
+Instructions: {instructions}
+
+User Reviews:
+{reviews}
+
+Extract the recipe modifications from each of these reviews."""
+
 FEW_SHOT_EXAMPLES = [
     {
         "review": "I added 2 cloves of garlic and baked at 400 degrees F for 12 minutes instead of 10 at 350. Turned out more flavorful and nicely browned.",
@@ -178,70 +216,135 @@ FEW_SHOT_EXAMPLES = [
 ]
 
 
-def build_few_shot_prompt(
-    review_text: str, title: str, ingredients: list, instructions: list
-) -> str:
-    """Build a few-shot prompt with examples for better extraction accuracy."""
+SIMPLE_OUTPUT_PROMPT = """Output a JSON object with this structure:
+{
+    "modification_type": "quantity_adjustment|ingredient_substitution|technique_change|addition|removal",
+    "reasoning": "Brief explanation of why this modification improves the recipe",
+    "edits": [
+        {
+            "target": "ingredients|instructions",
+            "operation": "replace|add_after|remove",
+            "find": "exact text to find",
+            "replace": "replacement text (for replace operations)",
+            "add": "text to add (for add_after operations)"
+        }
+    ]
+}
 
-    examples_text = "\n\n".join(
-        [
-            f"Example {i + 1}:\n"
-            f'Review: "{example["review"]}"\n'
-            f"Output: {example['expected_output']}"
-            for i, example in enumerate(
-                FEW_SHOT_EXAMPLES[:3]
-            )  # Use 3 most relevant examples
-        ]
-    )
+Focus on concrete changes the user actually made, not general suggestions."""
 
-    prompt = f"""{SYSTEM_PROMPT}
+SIMPLE_REQUEST_PROMPT = """Original Recipe:
+Title: {title}
+Ingredients: {ingredients}
+Instructions: {instructions}
+
+User Review: "{review_text}"
+
+Extract the recipe modifications from this review. The user has made changes to improve the recipe."""
+
+# Static prompt prefixes are rendered once at import. Keeping every dynamic field
+# out of the system message gives provider-side prompt caching a stable prefix.
+_FEW_SHOT_EXAMPLES_TEXT = "\n\n".join(
+    [
+        f"Example {i + 1}:\n"
+        f'Review: "{example["review"]}"\n'
+        f"Output: {orjson.dumps(example['expected_output']).decode()}"
+        # Use 3 most relevant examples
+        for i, example in enumerate(FEW_SHOT_EXAMPLES[:3])
+    ]
+)
+
+FEW_SHOT_SYSTEM_PROMPT = f"""{SYSTEM_PROMPT}
+
+{EXTRACTION_OUTPUT_PROMPT}
 
 Here are some examples of how to extract modifications:
 
-{examples_text}
+{_FEW_SHOT_EXAMPLES_TEXT}"""
 
-Now extract from this review:
+SIMPLE_SYSTEM_PROMPT = f"""{SYSTEM_PROMPT}
 
-{
-        EXTRACTION_PROMPT.format(
-            title=title,
-            ingredients=ingredients,
-            instructions=instructions,
-            review_text=review_text,
-        )
-    }"""
+{SIMPLE_OUTPUT_PROMPT}"""
 
-    return prompt
+BATCH_SYSTEM_PROMPT = f"""{SYSTEM_PROMPT}
 
+{BATCH_OUTPUT_PROMPT}"""
 
-def build_simple_prompt(
+# The simple request is split around the review so the recipe-dependent head can
+# be rendered once and shared by every review of the same recipe.
+_SIMPLE_REQUEST_HEAD, _SIMPLE_REQUEST_TAIL = SIMPLE_REQUEST_PROMPT.split(
+    "{review_text}"
+)
+
+
+@lru_cache(maxsize=128)
+def _simple_recipe_context(title: str, ingredients: tuple, instructions: tuple) -> str:
+    """Render the part of the simple request that depends only on the recipe."""
+    return _SIMPLE_REQUEST_HEAD.format(
+        title=title, ingredients=list(ingredients), instructions=list(instructions)
+    )
+
+
+def build_few_shot_messages(
     review_text: str, title: str, ingredients: list, instructions: list
-) -> str:
-    """Build a simple prompt without examples for faster processing."""
-    return f"""{SYSTEM_PROMPT}
+) -> list[dict[str, str]]:
+    """Build few-shot chat messages: a static system prefix and a dynamic user turn."""
+    user_prompt = "Now extract from this review:\n\n" + EXTRACTION_REQUEST_PROMPT.format(
+        title=title,
+        ingredients=ingredients,
+        instructions=instructions,
+        review_text=review_text,
+    )
+    return [
+        {"role": "system", "content": FEW_SHOT_SYSTEM_PROMPT},
+        {"role": "user", "content": user_prompt},
+    ]
 
-Original Recipe:
-Title: {title}
-Ingredients: {ingredients}
-Instructions: {instructions}
 
-User Review: "{review_text}"
+def build_simple_messages(
+    review_text: str, title: str, ingredients: list, instructions: list
+) -> list[dict[str, str]]:
+    """Build simple chat messages: a static system prefix and a dynamic user turn."""
+    recipe_context = _simple_recipe_context(
+        title, tuple(ingredients), tuple(instructions)
+    )
+    user_prompt = recipe_context + review_text + _SIMPLE_REQUEST_TAIL
+    return [
+        {"role": "system", "content": SIMPLE_SYSTEM_PROMPT},
+        {"role": "user", "content": user_prompt},
+    ]
 
-Extract the recipe modifications from this review. The user has made changes to improve the recipe.
 
-Output a JSON object with this structure:
-{{
-    "modification_type": "quantity_adjustment|ingredient_substitution|technique_change|addition|removal",
-    "reasoning": "Brief explanation of why this modification improves the recipe",
-    "edits": [
-        {{
-            "target": "ingredients|instructions",
-            "operation": "replace|add_after|remove",
-            "find": "exact text to find",
-            "replace": "replacement text (for replace operations)",
-            "add": "text to add (for add_after operations)"
-        }}
+def build_batch_messages(
+    review_texts: list, title: str, ingredients: list, instructions: list
+) -> list[dict[str, str]]:
+    """Build chat messages asking for modifications from several numbered reviews."""
+    reviews = "\n".join(
+        f'{i}. "{review_text}"' for i, review_text in enumerate(review_texts, 1)
+    )
+    user_prompt = BATCH_REQUEST_PROMPT.format(
+        title=title,
+        ingredients=ingredients,
+        instructions=instructions,
+        reviews=reviews,
+    )
+    return [
+        {"role": "system", "content": BATCH_SYSTEM_PROMPT},
+        {"role": "user", "content": user_prompt},
     ]
-}}
 
-Focus on concrete changes the user actually made, not general suggestions."""
+
+def build_few_shot_prompt(
+    review_text: str, title: str, ingredients: list, instructions: list
+) -> str:
+    """Build a few-shot prompt with examples for better extraction accuracy."""
+    messages = build_few_shot_messages(review_text, title, ingredients, instructions)
+    return "\n\n".join(message["content"] for message in messages)
+
+
+def build_simple_prompt(
+    review_text: str, title: str, ingredients: list, instructions: list
+) -> str:
+    """Build a simple prompt without examples for faster processing."""
+    messages = build_simple_messages(review_text, title, ingredients, instructions)
+    return "\n\n".join(message["content"] for message in messages)
@@ -5,11 +5,11 @@ This module applies structured modifications to recipes using search-and-replace
 It takes ModificationObject instances and applies their edits to recipe ingredients and instructions.
 """
 
-import copy
-from difflib import SequenceMatcher
-from typing import List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 
+import numpy as np
 from loguru import logger
+from rapidfuzz import fuzz, process
 
 from .models import (
     ModificationObject,
@@ -18,27 +18,47 @@ from .models import (
     ChangeRecord
 )
 
+# Shorter finds ("oven", "egg") appear in too many lines to trust a substring hit
+_MIN_SUBSTRING_TOKENS = 3
+
 
 class RecipeModifier:
     """Applies structured modifications to recipes using search-and-replace operations."""
 
-    def __init__(self, similarity_threshold: float = 0.6):
+    def __init__(
+        self,
+        similarity_threshold: float = 0.6,
+        scorer: Callable[..., float] = fuzz.ratio
+    ):
         """
         Initialize the RecipeModifier.
 
         Args:
             similarity_threshold: Minimum similarity score for fuzzy matching (0-1)
+            scorer: RapidFuzz scorer (0-100 scale). The thresholds here are tuned
+                for fuzz.ratio; partial scorers such as WRatio rate unrelated
+                lines that share a word highly and need stricter thresholds
         """
         self.similarity_threshold = similarity_threshold
+        self.scorer = scorer
         logger.info(f"Initialized RecipeModifier with similarity threshold: {similarity_threshold}")
 
-    def find_best_match(self, target: str, candidates: List[str]) -> Tuple[Optional[str], Optional[int], float]:
+    def find_best_match(
+        self,
+        target: str,
+        candidates: List[str],
+        candidates_lower: Optional[List[str]] = None
+    ) -> Tuple[Optional[str], Optional[int], float]:
         """
         Find the best matching string in a list of candidates.
 
+        Identical and unambiguous multi-word substring matches are returned
+        before any fuzzy scoring.
+
         Args:
             target: String to find
             candidates: List of strings to search in
+            candidates_lower: Lowercased candidates, if the caller already has them
 
         Returns:
             Tuple of (best_match, index, similarity_score)
@@ -46,50 +66,133 @@ class RecipeModifier:
         if not candidates:
             return None, None, 0.0
 
-        best_match = None
-        best_index = None
-        best_score = 0.0
+        if candidates_lower is None:
+            candidates_lower = [candidate.lower() for candidate in candidates]
 
-        for i, candidate in enumerate(candidates):
-            similarity = SequenceMatcher(None, target.lower(), candidate.lower()).ratio()
-            if similarity > best_score:
-                best_score = similarity
-                best_match = candidate
-                best_index = i
+        exact = self._exact_match(target, candidates, candidates_lower)
+        if exact is not None:
+            return exact
 
-        if best_score >= self.similarity_threshold:
-            return best_match, best_index, best_score
-        else:
-            return None, None, best_score
+        result = process.extractOne(
+            target.lower(),
+            candidates_lower,
+            scorer=self.scorer,
+            score_cutoff=self.similarity_threshold * 100
+        )
+
+        if result is None:
+            return None, None, 0.0
+
+        _, score, best_index = result
+        return candidates[best_index], best_index, score / 100
+
+    @staticmethod
+    def _exact_match(
+        target: str, candidates: List[str], candidates_lower: List[str]
+    ) -> Optional[Tuple[str, int, float]]:
+        """Return an unambiguous match found without fuzzy scoring, if any.
+
+        A candidate identical to the target (ignoring case and whitespace) scores
+        1.0. A find of at least _MIN_SUBSTRING_TOKENS words contained in exactly
+        one candidate scores 0.95; shorter or ambiguous finds such as "egg" are
+        left to fuzzy scoring.
+        """
+        target_tokens = target.lower().split()
+        if not target_tokens:
+            return None
+        target_norm = " ".join(target_tokens)
+
+        normalized = [" ".join(candidate.split()) for candidate in candidates_lower]
+        for i, candidate_norm in enumerate(normalized):
+            if candidate_norm == target_norm:
+                return candidates[i], i, 1.0
+
+        if len(target_tokens) < _MIN_SUBSTRING_TOKENS:
+            return None
+        containing = [i for i, c in enumerate(normalized) if target_norm in c]
+        if len(containing) == 1:
+            i = containing[0]
+            return candidates[i], i, 0.95
+        return None
+
+    def _match_from_scores(
+        self, scores: np.ndarray, candidates: List[str]
+    ) -> Tuple[Optional[str], Optional[int], float]:
+        """Pick the best match from a precomputed row of 0-100 similarity scores."""
+        best_index = int(scores.argmax())
+        best_score = float(scores[best_index]) / 100
+        if best_score and best_score >= self.similarity_threshold:
+            return candidates[best_index], best_index, best_score
+        return None, None, 0.0
+
+    def _score_edits(
+        self, edits: List[ModificationEdit], start: int, content_lower: List[str]
+    ) -> Dict[int, Optional[np.ndarray]]:
+        """Score edits[start:] that share edits[start]'s target against content in one cdist call."""
+        indices = [j for j in range(start, len(edits)) if edits[j].target == edits[start].target]
+        if not content_lower:
+            return dict.fromkeys(indices)
+
+        matrix = process.cdist(
+            [edits[j].find.lower() for j in indices],
+            content_lower,
+            scorer=self.scorer,
+            score_cutoff=self.similarity_threshold * 100
+        )
+        return dict(zip(indices, matrix))
+
+    def _match_edit(
+        self,
+        edit: ModificationEdit,
+        content: List[str],
+        content_lower: List[str],
+        scores: Optional[np.ndarray]
+    ) -> Tuple[Optional[str], Optional[int], float]:
+        """Locate edit.find in content, using a precomputed cdist row when available."""
+        if scores is None:
+            return self.find_best_match(edit.find, content, content_lower)
+        exact = self._exact_match(edit.find, content, content_lower)
+        if exact is not None:
+            return exact
+        return self._match_from_scores(scores, content)
 
     def apply_edit(
         self,
         edit: ModificationEdit,
-        recipe_content: List[str]
-    ) -> Tuple[List[str], List[ChangeRecord]]:
+        recipe_content: List[str],
+        scores: Optional[np.ndarray] = None,
+        content_lower: Optional[List[str]] = None
+    ) -> List[ChangeRecord]:
         """
-        Apply a single edit to a recipe content list.
+        Apply a single edit to a recipe content list in place.
 
         Args:
             edit: The edit operation to apply
-            recipe_content: List of ingredients or instructions
+            recipe_content: List of ingredients or instructions (mutated)
+            scores: Precomputed similarity of edit.find to each item (from cdist)
+            content_lower: Lowercased recipe_content, if the caller already has it;
+                kept in step with recipe_content
 
         Returns:
-            Tuple of (modified_content, change_records)
+            List of change records
         """
-        modified_content = copy.deepcopy(recipe_content)
+        modified_content = recipe_content
         change_records = []
 
         logger.debug(f"Applying {edit.operation} edit: find='{edit.find}'")
 
+        if content_lower is None:
+            content_lower = [item.lower() for item in modified_content]
+
+        match, index, score = self._match_edit(edit, modified_content, content_lower, scores)
+
         if edit.operation == "replace":
             # Find and replace text
-            match, index, score = self.find_best_match(edit.find, modified_content)
-
             if match and index is not None:
                 original_text = modified_content[index]
                 new_text = original_text.replace(edit.find, edit.replace or "")
                 modified_content[index] = new_text
+                content_lower[index] = new_text.lower()
 
                 change_records.append(ChangeRecord(
                     type="ingredient" if edit.target == "ingredients" else "instruction",
@@ -104,10 +207,9 @@ class RecipeModifier:
 
         elif edit.operation == "add_after":
             # Add new content after finding target
-            match, index, score = self.find_best_match(edit.find, modified_content)
-
             if match and index is not None and edit.add:
                 modified_content.insert(index + 1, edit.add)
+                content_lower.insert(index + 1, edit.add.lower())
 
                 change_records.append(ChangeRecord(
                     type="ingredient" if edit.target == "ingredients" else "instruction",
@@ -122,10 +224,9 @@ class RecipeModifier:
 
         elif edit.operation == "remove":
             # Remove matching content
-            match, index, score = self.find_best_match(edit.find, modified_content)
-
             if match and index is not None:
                 removed_text = modified_content.pop(index)
+                content_lower.pop(index)
 
                 change_records.append(ChangeRecord(
                     type="ingredient" if edit.target == "ingredients" else "instruction",
@@ -138,7 +239,23 @@ class RecipeModifier:
             else:
                 logger.warning(f"Could not find '{edit.find}' to remove")
 
-        return modified_content, change_records
+        return change_records
+
+    @staticmethod
+    def _copy_recipe(recipe: Recipe) -> Recipe:
+        """Clone a recipe for modification; its lists are copied, their strings shared."""
+        return Recipe.model_construct(
+            recipe_id=f"{recipe.recipe_id}_modified",
+            title=recipe.title,
+            ingredients=list(recipe.ingredients),
+            instructions=list(recipe.instructions),
+            description=recipe.description,
+            servings=recipe.servings,
+            prep_time=recipe.prep_time,
+            cook_time=recipe.cook_time,
+            total_time=recipe.total_time,
+            rating=recipe.rating
+        )
 
     def apply_modification(
         self,
@@ -155,39 +272,53 @@ class RecipeModifier:
         Returns:
             Tuple of (modified_recipe, all_change_records)
         """
-        logger.info(f"Applying {modification.modification_type} with {len(modification.edits)} edits")
+        modified_recipe = self._copy_recipe(recipe)
+        all_change_records = self._apply_modification_in_place(modified_recipe, modification)
+        return modified_recipe, all_change_records
 
-        # Deep copy the recipe
-        modified_recipe = Recipe(
-            recipe_id=f"{recipe.recipe_id}_modified",
-            title=recipe.title,
-            ingredients=copy.deepcopy(recipe.ingredients),
-            instructions=copy.deepcopy(recipe.instructions),
-            description=recipe.description,
-            servings=recipe.servings,
-            rating=recipe.rating
-        )
+    def _apply_modification_in_place(
+        self,
+        recipe: Recipe,
+        modification: ModificationObject
+    ) -> List[ChangeRecord]:
+        """Apply a modification's edits directly to recipe's lists and return the change records."""
+        logger.info(f"Applying {modification.modification_type} with {len(modification.edits)} edits")
 
         all_change_records = []
+        targets = {
+            "ingredients": recipe.ingredients,
+            "instructions": recipe.instructions
+        }
+
+        # Score edits against their target list in one cdist call; a list is
+        # rescored only for the edits that follow a change to it
+        edits = modification.edits
+        score_rows: Dict[int, Optional[np.ndarray]] = {}
+        lowered: Dict[str, List[str]] = {}
 
         # Apply each edit
-        for edit in modification.edits:
-            if edit.target == "ingredients":
-                modified_recipe.ingredients, change_records = self.apply_edit(
-                    edit, modified_recipe.ingredients
-                )
-            elif edit.target == "instructions":
-                modified_recipe.instructions, change_records = self.apply_edit(
-                    edit, modified_recipe.instructions
-                )
-            else:
+        for i, edit in enumerate(edits):
+            if edit.target not in targets:
                 logger.warning(f"Unknown edit target: {edit.target}")
                 continue
 
+            if edit.target not in lowered:
+                lowered[edit.target] = [item.lower() for item in targets[edit.target]]
+            if i not in score_rows:
+                score_rows.update(self._score_edits(edits, i, lowered[edit.target]))
+
+            change_records = self.apply_edit(
+                edit, targets[edit.target], score_rows.pop(i), lowered[edit.target]
+            )
+
+            if change_records:
+                for j in [j for j in score_rows if edits[j].target == edit.target]:
+                    del score_rows[j]
+
             all_change_records.extend(change_records)
 
         logger.info(f"Applied modification successfully: {len(all_change_records)} changes made")
-        return modified_recipe, all_change_records
+        return all_change_records
 
     def apply_modifications_batch(
         self,
@@ -204,7 +335,8 @@ class RecipeModifier:
         Returns:
             Tuple of (final_modified_recipe, list_of_change_records_per_modification)
         """
-        current_recipe = recipe
+        # Clone once; every modification then edits the same lists in place
+        current_recipe = self._copy_recipe(recipe)
         all_change_records = []
 
         logger.info(f"Applying {len(modifications)} modifications sequentially")
@@ -212,7 +344,7 @@ class RecipeModifier:
         for i, modification in enumerate(modifications):
             logger.info(f"Applying modification {i + 1}/{len(modifications)}: {modification.modification_type}")
 
-            current_recipe, change_records = self.apply_modification(current_recipe, modification)
+            change_records = self._apply_modification_in_place(current_recipe, modification)
             all_change_records.append(change_records)
 
         logger.info(f"Applied all modifications. Final recipe has {len(current_recipe.ingredients)} ingredients and {len(current_recipe.instructions)} instructions")
@@ -236,10 +368,22 @@ class RecipeModifier:
         warnings = []
         is_safe = True
 
-        for edit in modification.edits:
+        ingredients_lower = [item.lower() for item in recipe.ingredients]
+        instructions_lower = [item.lower() for item in recipe.instructions]
+
+        # Nothing is modified here, so each target list is scored by one cdist call
+        edits = modification.edits
+        score_rows: Dict[int, Optional[np.ndarray]] = {}
+
+        for i, edit in enumerate(edits):
             # Check if target content exists
-            target_content = recipe.ingredients if edit.target == "ingredients" else recipe.instructions
-            match, _, score = self.find_best_match(edit.find, target_content)
+            if edit.target == "ingredients":
+                target_content, target_lower = recipe.ingredients, ingredients_lower
+            else:
+                target_content, target_lower = recipe.instructions, instructions_lower
+            if i not in score_rows:
+                score_rows.update(self._score_edits(edits, i, target_lower))
+            match, _, score = self._match_edit(edit, target_content, target_lower, score_rows.pop(i))
 
             if not match:
                 warnings.append(f"Cannot find '{edit.find}' in {edit.target}")
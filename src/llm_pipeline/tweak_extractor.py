@@ -6,33 +6,206 @@ It converts natural language descriptions of recipe changes into structured
 ModificationObject instances.
 """
 
-import json
+import asyncio
 import os
-from typing import Optional
+import random
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
 
+import orjson
 from loguru import logger
-from openai import OpenAI
+from openai import (
+    APIConnectionError,
+    InternalServerError,
+    OpenAI,
+    RateLimitError,
+)
 from pydantic import ValidationError
 
 from .models import ModificationObject, Recipe, Review
-from .prompts import build_simple_prompt
+from .prompt_cache import PromptCache
+from .prompts import build_batch_messages, build_simple_messages
+
+# Upper bound on modifications remembered in memory by one extractor
+_SEEN_MAX_ENTRIES = 1024
+
+# Rate limits, timeouts and 5xx responses are worth waiting out before retrying
+_TRANSIENT_API_ERRORS = (APIConnectionError, InternalServerError, RateLimitError)
+_BACKOFF_BASE_SECONDS = 1.0
+_BACKOFF_MAX_SECONDS = 30.0
+
+
+def _backoff_delay(attempt: int) -> float:
+    """Exponential backoff with full jitter for the retry after a failed attempt."""
+    ceiling = min(_BACKOFF_MAX_SECONDS, _BACKOFF_BASE_SECONDS * 2**attempt)
+    return random.uniform(0, ceiling)
+
+
+def _normalize_review_text(text: str) -> str:
+    """Collapse case and whitespace so trivially reformatted reviews match."""
+    # Punctuation and non-ASCII text are kept: "½ cup" vs "¼ cup" or "1/2" vs
+    # "1-2" are different modifications and must not share a cache entry
+    return " ".join(text.casefold().split())
+
+
+class _JsonObjectBuffer:
+    """Accumulates streamed completion text until its top-level JSON object closes."""
+
+    def __init__(self):
+        self._parts: List[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    def feed_chunk(self, chunk: Any) -> bool:
+        """Append a streamed chunk's text; return True once the object is complete."""
+        if not chunk.choices or not chunk.choices[0].delta.content:
+            return False
+        text = chunk.choices[0].delta.content
+
+        for i, char in enumerate(text):
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == "{":
+                self._depth += 1
+            elif char == "}" and self._depth:
+                self._depth -= 1
+                if not self._depth:
+                    # Drop anything streamed after the closing brace
+                    self._parts.append(text[: i + 1])
+                    return True
+
+        self._parts.append(text)
+        return False
+
+    def getvalue(self) -> str:
+        """Text received so far."""
+        return "".join(self._parts)
+
+
+def _choose_modification_review(reviews: List[Review]) -> Optional[Review]:
+    """Pick a random review with modifications in one pass (reservoir of size one)."""
+    selected = None
+    seen = 0
+    for review in reviews:
+        if review.has_modification:
+            seen += 1
+            if random.random() < 1 / seen:
+                selected = review
+    return selected
 
 
 class TweakExtractor:
     """Extracts structured modifications from review text using LLM processing."""
 
-    def __init__(self, api_key: Optional[str] = None, model: str = "gpt-3.5-turbo"):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: str = "gpt-3.5-turbo",
+        cache: Optional[PromptCache] = None,
+    ):
         """
         Initialize the TweakExtractor.
 
         Args:
             api_key: OpenAI API key (defaults to OPENAI_API_KEY env var)
             model: OpenAI model to use for extraction
+            cache: Optional persistent cache of LLM responses keyed by prompt
+                (defaults to one under the TWEAK_CACHE_DIR env var, if set)
         """
         self.client = OpenAI(api_key=api_key or os.getenv("OPENAI_API_KEY"))
         self.model = model
+        self.temperature = 0.1  # Low temperature for consistent extractions
+        cache_dir = os.getenv("TWEAK_CACHE_DIR")
+        if cache is None and cache_dir:
+            cache = PromptCache(os.path.join(cache_dir, "prompt_cache.sqlite3"))
+        self.cache = cache
+        # Recently extracted modifications, keyed like the prompt cache (LRU,
+        # shared by the worker threads running async extractions)
+        self._seen: OrderedDict[bytes, ModificationObject] = OrderedDict()
+        self._seen_lock = threading.Lock()
         logger.info(f"Initialized TweakExtractor with model: {model}")
 
+    def _completion_kwargs(
+        self, messages: List[Dict[str, str]], max_tokens: int = 1000
+    ) -> Dict[str, Any]:
+        """Build the chat completion request shared by the single and batch paths."""
+        return {
+            "model": self.model,
+            "messages": messages,
+            "response_format": {"type": "json_object"},
+            "temperature": self.temperature,
+            "max_tokens": max_tokens,
+        }
+
+    def _cache_key(self, review: Review, recipe: Recipe) -> bytes:
+        """
+        Cache key for a review/recipe pair.
+
+        The key is built from the prompt with normalized review text, so
+        reviews that differ only in case or spacing share an entry.
+        """
+        messages = build_simple_messages(
+            _normalize_review_text(review.text),
+            recipe.title,
+            recipe.ingredients,
+            recipe.instructions,
+        )
+        prompt = "\n\n".join(message["content"] for message in messages)
+        return PromptCache.make_key(self.model, self.temperature, prompt)
+
+    def _get_cached_modification(
+        self, cache_key: bytes
+    ) -> Optional[ModificationObject]:
+        """Return a previously extracted modification for an equivalent prompt."""
+        with self._seen_lock:
+            modification = self._seen.get(cache_key)
+            if modification is not None:
+                self._seen.move_to_end(cache_key)
+        if modification is not None:
+            logger.info("Reusing modification extracted earlier for equivalent review")
+            return modification
+        if self.cache is None:
+            return None
+        raw_output = self.cache.get(cache_key)
+        if raw_output is None:
+            return None
+        try:
+            modification = ModificationObject.model_validate_json(raw_output)
+        except ValidationError as e:
+            logger.warning(f"Ignoring invalid cached response: {e}")
+            return None
+        logger.info("Using cached modification for equivalent review")
+        self._remember_in_memory(cache_key, modification)
+        return modification
+
+    def _remember_in_memory(
+        self, cache_key: bytes, modification: ModificationObject
+    ) -> None:
+        """Add a modification to the in-memory LRU, evicting the oldest entries."""
+        with self._seen_lock:
+            self._seen[cache_key] = modification
+            self._seen.move_to_end(cache_key)
+            while len(self._seen) > _SEEN_MAX_ENTRIES:
+                self._seen.popitem(last=False)
+
+    def _remember_modification(
+        self, cache_key: bytes, raw_output: str, modification: ModificationObject
+    ) -> None:
+        """Record a successful extraction in memory and in the persistent cache."""
+        self._remember_in_memory(cache_key, modification)
+        if self.cache is not None:
+            self.cache.set(cache_key, raw_output)
+
     def extract_modification(
         self,
         review: Review,
@@ -54,8 +227,8 @@ class TweakExtractor:
             logger.warning("Review has no modification flag set")
             return None
 
-        # Build the prompt - use simple prompt to avoid format string issues
-        prompt = build_simple_prompt(
+        # Static instructions go in the system message so the provider can cache them
+        messages = build_simple_messages(
             review.text, recipe.title, recipe.ingredients, recipe.instructions
         )
 
@@ -63,17 +236,26 @@ class TweakExtractor:
             "Extracting modification from review: {}...".format(review.text[:100])
         )
 
+        cache_key = self._cache_key(review, recipe)
+        cached = self._get_cached_modification(cache_key)
+        if cached:
+            return cached
+
         for attempt in range(max_retries + 1):
             try:
-                response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[{"role": "user", "content": prompt}],
-                    response_format={"type": "json_object"},
-                    temperature=0.1,  # Low temperature for consistent extractions
-                    max_tokens=1000,
+                # Stream so the request can be cut off once the object is complete
+                stream = self.client.chat.completions.create(
+                    **self._completion_kwargs(messages), stream=True
                 )
-
-                raw_output = response.choices[0].message.content
+                buffer = _JsonObjectBuffer()
+                try:
+                    for chunk in stream:
+                        if buffer.feed_chunk(chunk):
+                            break
+                finally:
+                    stream.close()
+
+                raw_output = buffer.getvalue()
                 logger.debug(f"LLM raw output: {raw_output}")
 
                 # Check if we got a response
@@ -81,27 +263,27 @@ class TweakExtractor:
                     logger.warning(f"Attempt {attempt + 1}: Empty response from LLM")
                     continue
 
-                # Parse and validate the JSON response
-                modification_data = json.loads(raw_output)
-                modification = ModificationObject(**modification_data)
+                # Parse and validate the JSON response in one pass
+                modification = ModificationObject.model_validate_json(raw_output)
 
                 logger.info(
                     f"Successfully extracted {modification.modification_type} "
                     f"modification with {len(modification.edits)} edits"
                 )
+                self._remember_modification(cache_key, raw_output, modification)
                 return modification
 
-            except json.JSONDecodeError as e:
-                logger.warning(f"Attempt {attempt + 1}: Failed to parse JSON: {e}")
+            except ValidationError as e:
+                # Covers malformed JSON as well as schema violations
+                logger.warning(f"Attempt {attempt + 1}: Invalid modification: {e}")
                 if attempt == max_retries:
                     logger.error(f"Max retries reached. Raw output: {raw_output}")
 
-            except ValidationError as e:
-                logger.warning(f"Attempt {attempt + 1}: Validation error: {e}")
+            except _TRANSIENT_API_ERRORS as e:
+                logger.warning(f"Attempt {attempt + 1}: Transient API error: {e}")
                 if attempt == max_retries:
-                    logger.error(
-                        f"Max retries reached. Invalid data: {modification_data}"
-                    )
+                    return None
+                time.sleep(_backoff_delay(attempt))
 
             except Exception as e:
                 logger.error(f"Attempt {attempt + 1}: Unexpected error: {e}")
@@ -123,20 +305,163 @@ class TweakExtractor:
         Returns:
             Tuple of (ModificationObject, source_Review) if successful, (None, None) otherwise
         """
-        import random
+        # Select one random review with modifications
+        selected_review = _choose_modification_review(reviews)
 
-        # Filter to reviews with modifications
-        modification_reviews = [r for r in reviews if r.has_modification]
+        if selected_review is None:
+            logger.warning("No reviews with modifications found")
+            return None, None
+
+        logger.info(f"Selected review: {selected_review.text[:100]}...")
+
+        modification = self.extract_modification(selected_review, recipe)
+        if modification:
+            logger.info("Successfully extracted modification from selected review")
+            return modification, selected_review
+        else:
+            logger.warning("Failed to extract modification from selected review")
+            return None, None
+
+    def extract_modifications_batch(
+        self,
+        reviews: list[Review],
+        recipe: Recipe,
+        batch_size: int = 8,
+        max_retries: int = 2,
+    ) -> List[Tuple[ModificationObject, Review]]:
+        """
+        Extract modifications from every review with modifications, several per LLM call.
 
+        Args:
+            reviews: List of reviews to extract from
+            recipe: Original recipe being modified
+            batch_size: Number of reviews sent in a single request
+            max_retries: Number of retry attempts per batch if parsing fails
+
+        Returns:
+            List of (ModificationObject, source_Review) pairs, in review order
+        """
+        modification_reviews = [r for r in reviews if r.has_modification]
         if not modification_reviews:
+            logger.warning("No reviews with modifications found")
+            return []
+
+        results = []
+        for start in range(0, len(modification_reviews), batch_size):
+            batch = modification_reviews[start : start + batch_size]
+            results.extend(self._extract_batch(batch, recipe, max_retries))
+
+        logger.info(
+            f"Extracted {len(results)} modifications from "
+            f"{len(modification_reviews)} reviews"
+        )
+        return results
+
+    def _extract_batch(
+        self, batch: list[Review], recipe: Recipe, max_retries: int
+    ) -> List[Tuple[ModificationObject, Review]]:
+        """Run one batched extraction request and map results back to reviews."""
+        messages = build_batch_messages(
+            [review.text for review in batch],
+            recipe.title,
+            recipe.ingredients,
+            recipe.instructions,
+        )
+        # Leave room for one full modification per review
+        max_tokens = min(4096, 1000 * len(batch))
+
+        for attempt in range(max_retries + 1):
+            try:
+                response = self.client.chat.completions.create(
+                    **self._completion_kwargs(messages, max_tokens=max_tokens)
+                )
+
+                raw_output = response.choices[0].message.content
+                logger.debug(f"LLM raw output: {raw_output}")
+
+                if not raw_output:
+                    logger.warning(f"Attempt {attempt + 1}: Empty response from LLM")
+                    continue
+
+                items = orjson.loads(raw_output).get("modifications", [])
+
+                results = []
+                for item in items:
+                    index = item.get("review_index")
+                    if not isinstance(index, int) or not 1 <= index <= len(batch):
+                        logger.warning(f"Skipping invalid review_index: {index}")
+                        continue
+                    try:
+                        results.append((ModificationObject(**item), batch[index - 1]))
+                    except ValidationError as e:
+                        logger.warning(f"Skipping invalid modification {index}: {e}")
+                return results
+
+            except orjson.JSONDecodeError as e:
+                logger.warning(f"Attempt {attempt + 1}: Failed to parse JSON: {e}")
+                if attempt == max_retries:
+                    logger.error(f"Max retries reached. Raw output: {raw_output}")
+
+            except _TRANSIENT_API_ERRORS as e:
+                logger.warning(f"Attempt {attempt + 1}: Transient API error: {e}")
+                if attempt == max_retries:
+                    return []
+                time.sleep(_backoff_delay(attempt))
+
+            except Exception as e:
+                logger.error(f"Attempt {attempt + 1}: Unexpected error: {e}")
+                if attempt == max_retries:
+                    return []
+
+        return []
+
+    async def aextract_modification(
+        self,
+        review: Review,
+        recipe: Recipe,
+        max_retries: int = 2,
+    ) -> Optional[ModificationObject]:
+        """
+        Async variant of extract_modification.
+
+        The blocking call runs in a worker thread on the shared sync client, so
+        every event loop (Flask starts one per async request) reuses the same
+        connection pool instead of opening a client of its own.
+
+        Args:
+            review: Review object containing modification text
+            recipe: Original recipe being modified
+            max_retries: Number of retry attempts if parsing fails
+
+        Returns:
+            ModificationObject if extraction successful, None otherwise
+        """
+        return await asyncio.to_thread(
+            self.extract_modification, review, recipe, max_retries
+        )
+
+    async def aextract_single_modification(
+        self, reviews: list[Review], recipe: Recipe
+    ) -> tuple[ModificationObject, Review] | tuple[None, None]:
+        """
+        Async variant of extract_single_modification.
+
+        Args:
+            reviews: List of reviews to choose from
+            recipe: Original recipe being modified
+
+        Returns:
+            Tuple of (ModificationObject, source_Review) if successful, (None, None) otherwise
+        """
+        selected_review = _choose_modification_review(reviews)
+
+        if selected_review is None:
             logger.warning("No reviews with modifications found")
             return None, None
 
-        # Select one random review
-        selected_review = random.choice(modification_reviews)
         logger.info(f"Selected review: {selected_review.text[:100]}...")
 
-        modification = self.extract_modification(selected_review, recipe)
+        modification = await self.aextract_modification(selected_review, recipe)
         if modification:
             logger.info("Successfully extracted modification from selected review")
             return modification, selected_review
@@ -144,6 +469,42 @@ class TweakExtractor:
             logger.warning("Failed to extract modification from selected review")
             return None, None
 
+    async def aextract_modifications(
+        self, reviews: List[Review], recipe: Recipe, concurrency: int = 5
+    ) -> List[Tuple[ModificationObject, Review]]:
+        """
+        Extract modifications from each review with one concurrent request per review.
+
+        Args:
+            reviews: Reviews to extract from (only those with modifications are sent)
+            recipe: Original recipe being modified
+            concurrency: Maximum number of in-flight API requests
+
+        Returns:
+            List of (ModificationObject, source_Review) pairs for successful extractions
+        """
+        modification_reviews = [r for r in reviews if r.has_modification]
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _extract(review: Review) -> Optional[ModificationObject]:
+            async with semaphore:
+                return await self.aextract_modification(review, recipe)
+
+        modifications = await asyncio.gather(
+            *(_extract(review) for review in modification_reviews)
+        )
+        return [
+            (modification, review)
+            for modification, review in zip(modifications, modification_reviews)
+            if modification
+        ]
+
+    def extract_modifications(
+        self, reviews: List[Review], recipe: Recipe, concurrency: int = 5
+    ) -> List[Tuple[ModificationObject, Review]]:
+        """Blocking wrapper around aextract_modifications for synchronous callers."""
+        return asyncio.run(self.aextract_modifications(reviews, recipe, concurrency))
+
     def test_extraction(
         self, review_text: str, recipe_data: dict
     ) -> Optional[ModificationObject]:
@@ -0,0 +1,78 @@
+"""
+Recipe file store for the Flask API.
+
+Keeps an id -> file index of the scraped recipes in data/ on the app config
+and loads recipe JSON on demand.
+"""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+
+import orjson
+from flask import current_app
+
+DATA_DIR = "data"
+
+
+def build_recipe_index(data_dir: str = DATA_DIR) -> dict[str, dict[str, str]]:
+    """Scan the data directory once and map recipe ids to their file path and name."""
+    index = {}
+    with os.scandir(data_dir) as entries:
+        for entry in entries:
+            if not (
+                entry.is_file()
+                and entry.name.startswith("recipe_")
+                and entry.name.endswith(".json")
+            ):
+                continue
+            recipe_id, _, recipe_name = entry.name[
+                len("recipe_") : -len(".json")
+            ].partition("_")
+            index[recipe_id] = {"path": entry.path, "name": recipe_name}
+    return index
+
+
+def get_recipe_index() -> dict[str, dict[str, str]]:
+    """Return the cached recipe index, rebuilding it if the data directory changed."""
+    mtime = os.stat(DATA_DIR).st_mtime
+    if current_app.config.get("RECIPE_INDEX_MTIME") != mtime:
+        current_app.config["RECIPE_INDEX"] = build_recipe_index()
+        current_app.config["RECIPE_INDEX_MTIME"] = mtime
+    return current_app.config["RECIPE_INDEX"]
+
+
+def _load_recipe_file(path: str) -> Dict:
+    # Hand raw bytes straight to orjson to skip the text-decode copy
+    with open(path, "rb") as f:
+        return orjson.loads(f.read())
+
+
+def read_all_recipes() -> list[Dict]:
+    index = get_recipe_index()
+    if not index:
+        return []
+
+    def _load_one(item: tuple[str, dict[str, str]]) -> Dict:
+        recipe_id, entry = item
+        return {
+            "id": recipe_id,
+            "name": entry["name"],
+            "data": _load_recipe_file(entry["path"]),
+        }
+
+    with ThreadPoolExecutor(max_workers=min(32, len(index))) as executor:
+        return list(executor.map(_load_one, index.items()))
+
+
+def read_recipe(id: str) -> Optional[Dict]:
+    entry = get_recipe_index().get(id)
+    if entry is None:
+        return None
+    return {
+        "id": id,
+        "name": entry["name"],
+        "data": _load_recipe_file(entry["path"]),
+    }
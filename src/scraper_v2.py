@@ -1,10 +1,136 @@
+import io
 import json
+import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
+from itertools import chain
 from typing import Any, Dict, List, Optional
 
+import orjson
 import requests
-from bs4 import BeautifulSoup
+import soupsieve
+from bs4 import BeautifulSoup, SoupStrainer
+from lxml import etree
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+def _create_session() -> requests.Session:
+    """Build the pooled HTTP session (SCRAPER_CACHE=1 caches responses on disk)"""
+    if os.getenv("SCRAPER_CACHE") == "1":
+        import requests_cache
+
+        session = requests_cache.CachedSession(
+            "allrecipes_cache", backend="sqlite", expire_after=86400
+        )
+    else:
+        session = requests.Session()
+
+    # Browser User-Agent to avoid blocking
+    session.headers.update(
+        {
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+        }
+    )
+    session.mount(
+        "https://",
+        HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=32,
+            max_retries=Retry(total=3, backoff_factor=0.3),
+        ),
+    )
+    return session
+
+
+# One session for every request so repeated fetches from the same host skip the
+# TCP/TLS handshake
+_SESSION = _create_session()
+_REQUEST_TIMEOUT = (3.05, 15)  # (connect, read) seconds
+_SCRAPE_WORKERS = 8  # Concurrent page fetches in main(); stays under pool_maxsize
+
+# CSS selectors are tried in priority order; each is compiled once by
+# _compile_selector and reused for every page and review
+_TEXT_SELECTORS = [
+    "div.ugc-review__text",
+    'div[class*="ugc-review__text"]',
+    'div[class*="recipe-review__text"]',
+    'div[class*="ReviewText"]',
+    'div[class*="ugc-review-body"]',
+    'p[class*="review"]',
+]
+
+_RATING_SELECTORS = [
+    "div.ugc-review__rating",
+    'div[class*="ugc-review__rating"]',
+    'span[class*="rating-stars"]',
+    'div[class*="RatingStar"]',
+    'span[aria-label*="rated "][aria-label*=" out of 5"]',
+]
+
+_USER_SELECTORS = [
+    'span[class*="recipe-review__author"]',
+    'span[class*="reviewer-name"]',
+    'a[class*="cook-name"]',
+]
+
+_REVIEW_DATE_SELECTOR = (
+    'span[class*="recipe-review__date"], time[class*="recipe-review__date"]'
+)
+_RATED_RE = re.compile(r"rated (\d+)")
+
+# Common patterns for recipe modifications, fused into one alternation so each
+# review is scanned once. Word boundaries keep e.g. "unless" or "furthermore"
+# from reading as a quantity change.
+_TWEAK_PATTERNS = [
+    r"\bI (added|used|substituted|replaced|made with|changed)\b",
+    r"\b(instead of|rather than|in place of)\b",
+    r"\b(next time|will make again|definitely make)\b",
+    r"\b(doubled|tripled|halved|increased|decreased)\b",
+    r"\b(more|less|extra)\s+\w+",
+]
+_TWEAK_RE = re.compile("|".join(_TWEAK_PATTERNS), re.IGNORECASE)
+
+_RECIPE_ID_RE = re.compile(r"(?:^|/)recipe/([^/]*)")
+_SLUG_RE = re.compile(r"[^a-z0-9]+")
+
+_PHOTO_DIALOG_ITEM_SELECTOR = 'div[class*="photo-dialog__item"]'
+_PHOTO_DIALOG_REVIEW_SELECTOR = "div.ugc-review"
+
+_MAX_REVIEWS = 30
+
+_REVIEW_SELECTORS = [
+    "div.ugc-review",  # Exact class first
+    'div[class*="ugc-review"]',  # Then substring
+    'div[class*="ReviewCard__container"]',
+    'div[class*="review-container"]',
+    'article[class*="review"]',
+]
+
+# Only top-level tags matching these names (and everything nested inside them)
+# are turned into Python objects; <head> boilerplate, <style>, <img> etc. are
+# skipped by the parser instead of being built and ignored
+_PAGE_STRAINER = SoupStrainer(
+    ["h1", "script", "div", "article", "span", "time", "a", "p"]
+)
+
+
+@lru_cache(maxsize=64)
+def _compile_selector(selector: str) -> soupsieve.SoupSieve:
+    """Compile a CSS selector once so repeated lookups skip parsing it"""
+    return soupsieve.compile(selector)
+
+
+def _select(elem, selector: str, limit: int = 0) -> List:
+    """All elements under elem matching a CSS selector"""
+    return _compile_selector(selector).select(elem, limit=limit)
+
+
+def _select_one(elem, selector: str):
+    """First element under elem matching a CSS selector, or None"""
+    return _compile_selector(selector).select_one(elem)
 
 
 def extract_review_data(review_elem) -> Dict:
@@ -12,17 +138,8 @@ def extract_review_data(review_elem) -> Dict:
     review_data = {}
 
     # Try to extract review text - updated selectors based on actual HTML
-    text_selectors = [
-        ("div", {"class": "ugc-review__text"}),
-        ("div", {"class": re.compile(r"ugc-review__text")}),
-        ("div", {"class": re.compile(r"recipe-review__text")}),
-        ("div", {"class": re.compile(r"ReviewText")}),
-        ("div", {"class": re.compile(r"ugc-review-body")}),
-        ("p", {"class": re.compile(r"review")}),
-    ]
-
-    for tag, attrs in text_selectors:
-        text_elem = review_elem.find(tag, attrs)
+    for selector in _TEXT_SELECTORS:
+        text_elem = _select_one(review_elem, selector)
         if text_elem:
             review_text = text_elem.get_text(strip=True)
             if review_text:
@@ -30,85 +147,74 @@ def extract_review_data(review_elem) -> Dict:
                 break
 
     # Try to extract rating
-    rating_selectors = [
-        ("div", {"class": "ugc-review__rating"}),
-        ("div", {"class": re.compile(r"ugc-review__rating")}),
-        ("span", {"class": re.compile(r"rating-stars")}),
-        ("div", {"class": re.compile(r"RatingStar")}),
-        ("span", {"aria-label": re.compile(r"rated \d+ out of 5")}),
-    ]
-
-    for tag, attrs in rating_selectors:
-        rating_elem = review_elem.find(tag, attrs)
+    for selector in _RATING_SELECTORS:
+        rating_elem = _select_one(review_elem, selector)
         if rating_elem:
             # Try to extract number from aria-label or count stars
             aria_label = rating_elem.get("aria-label", "")
-            rating_match = re.search(r"rated (\d+)", aria_label)
+            rating_match = _RATED_RE.search(aria_label)
             if rating_match:
                 review_data["rating"] = int(rating_match.group(1))
             else:
-                # Count filled stars (SVG elements with class icon-star)
-                stars = rating_elem.find_all("svg", {"class": "icon-star"})
-                if stars:
-                    review_data["rating"] = len(stars)
+                # Count filled stars (SVG elements with class icon-star) by
+                # streaming descendants rather than building a list of tags
+                star_count = sum(
+                    1
+                    for elem in rating_elem.descendants
+                    if elem.name == "svg" and "icon-star" in elem.get("class", ())
+                )
+                if star_count:
+                    review_data["rating"] = star_count
             break
 
     # Try to extract username
-    user_selectors = [
-        ("span", {"class": re.compile(r"recipe-review__author")}),
-        ("span", {"class": re.compile(r"reviewer-name")}),
-        ("a", {"class": re.compile(r"cook-name")}),
-    ]
-
-    for tag, attrs in user_selectors:
-        user_elem = review_elem.find(tag, attrs)
+    for selector in _USER_SELECTORS:
+        user_elem = _select_one(review_elem, selector)
         if user_elem:
             review_data["username"] = user_elem.get_text(strip=True)
             break
 
     # Try to extract date
-    date_elem = review_elem.find(
-        ["span", "time"], {"class": re.compile(r"recipe-review__date")}
-    )
+    date_elem = _select_one(review_elem, _REVIEW_DATE_SELECTOR)
     if date_elem:
         review_data["date"] = date_elem.get_text(strip=True)
 
     # Look for modifications/tweaks in review text
-    if review_data.get("text"):
-        # Common patterns for recipe modifications
-        tweak_patterns = [
-            r"I (added|used|substituted|replaced|made with|changed)",
-            r"(instead of|rather than|in place of)",
-            r"(next time|will make again|definitely make)",
-            r"(doubled|tripled|halved|increased|decreased)",
-            r"(more|less|extra) ([\w\s]+)",
-        ]
-
-        for pattern in tweak_patterns:
-            if re.search(pattern, review_data["text"], re.IGNORECASE):
-                review_data["has_modification"] = True
-                break
+    if review_data.get("text") and _TWEAK_RE.search(review_data["text"]):
+        review_data["has_modification"] = True
 
     return review_data
 
 
+def _parse_json_ld(text: str) -> Any:
+    """Parse a JSON-LD blob with orjson, falling back to json for what it rejects"""
+    try:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError:
+        # e.g. NaN/Infinity literals, which the stdlib parser accepts
+        return json.loads(text)
+
+
 def extract_recipe_from_json_ld(data: Any) -> Optional[Dict]:
     """Extract recipe data from various JSON-LD formats"""
-    # If it's a dict with @type
-    if isinstance(data, dict):
-        types = data.get("@type", [])
-        # Handle multiple types
-        if isinstance(types, list) and "Recipe" in types:
-            return data
-        elif types == "Recipe":
-            return data
-
-    # If it's an array
-    elif isinstance(data, list):
-        for item in data:
-            recipe = extract_recipe_from_json_ld(item)
-            if recipe:
-                return recipe
+    # Walk nested arrays depth-first with an explicit stack instead of recursion;
+    # reversed() keeps the first Recipe in document order on top
+    pending = [data]
+    while pending:
+        node = pending.pop()
+
+        # If it's a dict with @type
+        if isinstance(node, dict):
+            types = node.get("@type", [])
+            # Handle multiple types
+            if isinstance(types, list) and "Recipe" in types:
+                return node
+            elif types == "Recipe":
+                return node
+
+        # If it's an array
+        elif isinstance(node, list):
+            pending.extend(reversed(node))
 
     return None
 
@@ -124,14 +230,10 @@ def scrape_allrecipes(url: str) -> Optional[Dict]:
         Dictionary containing recipe data or None if scraping fails
     """
     try:
-        # Send request with headers to avoid blocking
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        }
-        response = requests.get(url, headers=headers)
+        response = _SESSION.get(url, timeout=_REQUEST_TIMEOUT)
         response.raise_for_status()
 
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = BeautifulSoup(response.content, "lxml", parse_only=_PAGE_STRAINER)
 
         # Extract recipe data
         recipe_data = {
@@ -140,11 +242,9 @@ def scrape_allrecipes(url: str) -> Optional[Dict]:
         }
 
         # Get recipe ID from URL
-        url_parts = url.split("/")
-        for i, part in enumerate(url_parts):
-            if part == "recipe" and i + 1 < len(url_parts):
-                recipe_data["recipe_id"] = url_parts[i + 1]
-                break
+        recipe_id_match = _RECIPE_ID_RE.search(url)
+        if recipe_id_match:
+            recipe_data["recipe_id"] = recipe_id_match.group(1)
 
         # Get recipe title from H1 if available
         title_element = soup.find("h1")
@@ -156,8 +256,12 @@ def scrape_allrecipes(url: str) -> Optional[Dict]:
         recipe_found = None
 
         for json_ld in json_ld_scripts:
+            # Cheap substring check skips BreadcrumbList/WebPage blobs unparsed
+            script_text = json_ld.string
+            if not script_text or '"Recipe"' not in script_text:
+                continue
             try:
-                structured_data = json.loads(json_ld.string)
+                structured_data = _parse_json_ld(script_text)
                 recipe_found = extract_recipe_from_json_ld(structured_data)
                 if recipe_found:
                     break
@@ -237,15 +341,14 @@ def scrape_allrecipes(url: str) -> Optional[Dict]:
         recipe_data["featured_tweaks"] = []
 
         # Look for photo dialog items which often contain featured reviews
-        photo_dialog_items = soup.find_all(
-            "div", {"class": re.compile(r"photo-dialog__item")}
-        )
+        # Check top 10 items; the limit stops the tree walk once they are found
+        photo_dialog_items = _select(soup, _PHOTO_DIALOG_ITEM_SELECTOR, limit=10)
 
         if photo_dialog_items:
             potential_tweaks = []
-            for item in photo_dialog_items[:10]:  # Check top 10 items
+            for item in photo_dialog_items:
                 # Extract review from within the photo dialog item
-                review_section = item.find("div", {"class": "ugc-review"})
+                review_section = _select_one(item, _PHOTO_DIALOG_REVIEW_SELECTOR)
                 if review_section:
                     tweak_data = extract_review_data(review_section)
                     if (
@@ -268,30 +371,24 @@ def scrape_allrecipes(url: str) -> Optional[Dict]:
         recipe_data["reviews"] = []
 
         # Try different review selectors - prioritize ugc-review which is the current class
-        review_selectors = [
-            ("div", {"class": "ugc-review"}),  # Exact match first
-            ("div", {"class": re.compile(r"ugc-review")}),  # Then regex
-            ("div", {"class": re.compile(r"ReviewCard__container")}),
-            ("div", {"class": re.compile(r"review-container")}),
-            ("article", {"class": re.compile(r"review")}),
-        ]
-
-        reviews_found = []
-        for tag, attrs in review_selectors:
-            reviews_found = soup.find_all(
-                tag, attrs, limit=50
-            )  # Limit to 50 for performance
-            if reviews_found:
-                print(
-                    f"Found {len(reviews_found)} reviews using selector: {tag} {attrs}"
-                )
+        # Matches are streamed so the tree walk stops once enough reviews are kept
+        reviews_found = iter(())
+        for selector in _REVIEW_SELECTORS:
+            candidates = _compile_selector(selector).iselect(soup)
+            first = next(candidates, None)
+            if first is not None:
+                print(f"Found reviews using selector: {selector}")
+                reviews_found = chain((first,), candidates)
                 break
 
-        # Parse reviews using the helper function
-        for review_elem in reviews_found[:30]:  # Get up to 30 reviews
+        # Parse reviews using the helper function, stopping at the first
+        # _MAX_REVIEWS that actually carry text
+        for review_elem in reviews_found:
             review_data = extract_review_data(review_elem)
             if review_data and review_data.get("text"):
                 recipe_data["reviews"].append(review_data)
+                if len(recipe_data["reviews"]) >= _MAX_REVIEWS:
+                    break
 
         print(f"Extracted {len(recipe_data['reviews'])} reviews")
 
@@ -305,6 +402,12 @@ def scrape_allrecipes(url: str) -> Optional[Dict]:
         return None
 
 
+@lru_cache(maxsize=1)
+def _ensure_data_dir() -> None:
+    """Create the data directory if it doesn't exist (checked once per process)"""
+    os.makedirs("data", exist_ok=True)
+
+
 def save_recipe_data(recipe_data: Dict, filename: str = None) -> str:
     """
     Save recipe data to a JSON file.
@@ -318,20 +421,16 @@ def save_recipe_data(recipe_data: Dict, filename: str = None) -> str:
     """
     if filename is None:
         recipe_id = recipe_data.get("recipe_id", "unknown")
-        title_slug = re.sub(r"[^a-z0-9]+", "-", recipe_data.get("title", "").lower())[
-            :50
-        ]
+        title_slug = _SLUG_RE.sub("-", recipe_data.get("title", "").lower())[:50]
         filename = f"data/recipe_{recipe_id}_{title_slug}.json"
 
-    # Create data directory if it doesn't exist
-    import os
-
-    os.makedirs("data", exist_ok=True)
+    _ensure_data_dir()
 
     filepath = filename if "/" in filename else f"data/{filename}"
 
-    with open(filepath, "w", encoding="utf-8") as f:
-        json.dump(recipe_data, f, indent=2, ensure_ascii=False)
+    # orjson writes UTF-8 bytes directly, matching json.dump(indent=2, ensure_ascii=False)
+    with open(filepath, "wb") as f:
+        f.write(orjson.dumps(recipe_data, option=orjson.OPT_INDENT_2))
 
     print(f"Saved recipe data to {filepath}")
     return filepath
@@ -350,19 +449,21 @@ def scrape_sitemap_recipes(limit: int = 50) -> List[str]:
     sitemap_url = "https://www.allrecipes.com/sitemap_1.xml"
 
     try:
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-        }
-        response = requests.get(sitemap_url, headers=headers)
+        response = _SESSION.get(sitemap_url, timeout=_REQUEST_TIMEOUT)
         response.raise_for_status()
 
-        # Parse XML to find recipe URLs
-        soup = BeautifulSoup(response.content, "xml")
+        # Stream <loc> elements so parsing stops after the first `limit` recipes
+        # instead of building a tree for the whole sitemap
         urls = []
-
-        for loc in soup.find_all("loc"):
-            url = loc.text
-            if "/recipe/" in url and url not in urls:
+        seen = set()  # O(1) membership; `urls` keeps sitemap order
+
+        # recover=True keeps the lenient behaviour of the old lxml-xml soup parse
+        sitemap = io.BytesIO(response.content)
+        for _, loc in etree.iterparse(sitemap, tag="{*}loc", recover=True):
+            url = loc.text or ""
+            loc.clear()
+            if "/recipe/" in url and url not in seen:
+                seen.add(url)
                 urls.append(url)
                 if len(urls) >= limit:
                     break
@@ -385,9 +486,7 @@ def main():
     """
     Main function to demonstrate scraping functionality.
     """
-    import os
-
-    os.makedirs("data", exist_ok=True)
+    _ensure_data_dir()
 
     # Test with a single recipe first
     test_url = "https://www.allrecipes.com/recipe/10813/best-chocolate-chip-cookies/"
@@ -423,16 +522,19 @@ def main():
     recipe_urls = scrape_sitemap_recipes(limit=5)
     print(f"Found {len(recipe_urls)} recipe URLs to scrape")
 
+    # Scraping is network-bound, so fetch several pages at once; results come
+    # back in URL order and are saved here on the main thread
     successful = 0
-    for i, url in enumerate(recipe_urls, 1):
-        print(f"\n[{i}/{len(recipe_urls)}] Scraping: {url}")
-        recipe_data = scrape_allrecipes(url)
-        if recipe_data:
-            save_recipe_data(recipe_data)
-            successful += 1
-            print("  ✓ Success")
-        else:
-            print("  ✗ Failed")
+    with ThreadPoolExecutor(max_workers=_SCRAPE_WORKERS) as executor:
+        results = executor.map(scrape_allrecipes, recipe_urls)
+        for i, (url, recipe_data) in enumerate(zip(recipe_urls, results), 1):
+            print(f"\n[{i}/{len(recipe_urls)}] Scraped: {url}")
+            if recipe_data:
+                save_recipe_data(recipe_data)
+                successful += 1
+                print("  ✓ Success")
+            else:
+                print("  ✗ Failed")
 
     print("\n" + "=" * 60)
     print(f"Summary: Successfully scraped {successful}/{len(recipe_urls)} recipes")